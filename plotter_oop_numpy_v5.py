@@ -26,275 +26,189 @@ from tkinter import ttk
 import os
 import sys
 import csv
+import threading
+import re
+import io
+import json
+import time
+import socket
+import ast
+import pickle
+from http.server import ThreadingHTTPServer,BaseHTTPRequestHandler
+from urllib.parse import urlparse,parse_qs
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import colorchooser,simpledialog,filedialog
 from matplotlib.backends.backend_tkagg import (FigureCanvasTkAgg,NavigationToolbar2Tk)
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.transforms import Bbox
 from matplotlib.figure import Figure
 from matplotlib import cm
+from matplotlib.collections import LineCollection
+from matplotlib.colors import LogNorm,Normalize,hsv_to_rgb
 from numpy import *
+from numpy.polynomial import chebyshev,legendre
 from scipy.optimize import root_scalar
 from scipy.integrate import quad
+from scipy.fft import rfft,rfftfreq,next_fast_len,dct
+from scipy.signal import get_window,welch
 
 
-# Class for the application derived from tkinter.Tk
-class Plotter(tkinter.Tk): 
+# color presets for menu Color presets, arguments for Plotcore.setcolors()
+colorpresets={
+    "Greys":{},
+    "Blues":dict(linecolor="#666eff",axiscolor="#2671e8",labelcolor="#2671e8", \
+        gridcolor="#462ab4",plotbackgroundcolor="#10100b",backgroundcolor="#000000", colormap=cm.Blues_r),
+    "Greens":dict(linecolor="#49ff3c",axiscolor="#bcd308",labelcolor="#bcd308", \
+        gridcolor="#bcd308",plotbackgroundcolor="#303030",backgroundcolor="#303030", colormap=cm.Greens_r),
+    "Reds":dict(linecolor="#e36853",axiscolor="#d15e31",labelcolor="#d15e31", \
+        gridcolor="#a92c2c",plotbackgroundcolor="#000000",backgroundcolor="#2c080e", colormap=cm.Reds_r),
+    "Blue on white":dict(linecolor="#03007B",axiscolor="#6967CC",labelcolor="#6967CC", \
+        gridcolor="#9D9BD5",plotbackgroundcolor="#FFFFFF",backgroundcolor="#D0CFEE", colormap=cm.Blues),
+    }
+
+
+# evaluation of the expression and plotting on a Matplotlib Figure object, without Tkinter
+# used by the Plotter application and by the Renderer of the render server
+# self.fig, self.ax and self.canvas are made by the derived class
+class Plotcore: 
     def __init__(self): 
-        super().__init__() # call init from parent class
-        self.title("Plotter using Matplotlib in Tkinter")
-        self.resizable(width=True,height=True)
-        self.geometry("1100x750") # afmetingen voor start
-        self.configure(bg='#A0A0A0')
-        
         # instance variables
-        
-        self.invphi = (sqrt(5) - 1) / 2  # 1 / phi # constant for numeric method
-        
-        self.initexpr = "x" # expression to be plotted, a simple "x" at startup
+        self.txt = "x" # expression to be plotted
+        self.evalglobals = globals() # names available in the expression, restricted by the Renderer
         self.tstart = -1.0 # startvalue for x
         self.tstop = 1.0 # endvalue for x
         self.N = 1000 # number of values in plot
         self.linethickness = 2 # line thickness used for plot
         self.fontsize = 15
-        self.xymode = tkinter.BooleanVar() # mode voor xy plot
-        self.xymode.set(False)
-        self.polarmode = tkinter.BooleanVar() # mode voor polar plot
-        self.polarmode.set(False)
-        self.line3dmode = tkinter.BooleanVar() # mode voor 3d line plot
-        self.line3dmode.set(False)
-        self.surface3dmode = tkinter.BooleanVar() # mode voor 3d surface plot
-        self.surface3dmode.set(False)
-        
-        
-        # set behaviour at resizing for the various grid rows and column
-        self.rowconfigure(0, weight = 3)
-        self.rowconfigure(1, weight = 0)
-        self.rowconfigure(2, weight = 0)
-        self.rowconfigure(3, weight = 0)
-        self.rowconfigure(4, weight = 0)
-        self.columnconfigure(0, weight = 1)
-        
-        # define Figure object from Matplotlib and set background color
-        self.fig = Figure()
-        self.fig.patch.set_facecolor('#ffffff')
-        
-        # generate a plot from the Fifure object - Matplotlib
-        self.ax = self.fig.add_subplot()  
-        
-        # generate a canvas object from Matplotlib with the Figure object 
-        # from matplotlib and the Tk object from Tkinter as argument
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self)  # A tk.DrawingArea.
-        self.canvas.get_tk_widget().configure(background='#ffffff')
-        self.canvas.draw()        
-        
-        # define menus - Tkinter
-        self.menubar=tkinter.Menu(self,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
-        self.menufile=tkinter.Menu(self.menubar,tearoff=0,background="#A0A0A0", fg="#000000",font=("calibri",11,"bold"))
-        self.menufile.add_command(label="Save as CSV",command=self.saveascsv)
-        self.menufile.add_command(label="Save as image",command=self.saveasimg)
-        self.menufile.add_separator()
-        self.menufile.add_command(label="Exit",command=self.destroy)
-        self.menubar.add_cascade(label="File",menu=self.menufile)
-        self.menutools=tkinter.Menu(self.menubar,tearoff=0,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
-        self.menutools.add_command(label="Find root",command=self.findroot)
-        self.menutools.add_command(label="Find maximum",command=self.findmaximum)
-        self.menutools.add_command(label="Find minimum",command=self.findminimum)
-        self.menutools.add_command(label="Integrate",command=self.findintegralscipyquad)        
-        self.menubar.add_cascade(label="Tools",menu=self.menutools)
-        self.menusettings=tkinter.Menu(self.menubar,tearoff=0,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
-        self.menusettings.add_command(label="Number of points",command=self.setnumberofpoints)
-        self.menusettings.add_separator()
-        self.submenucolors=tkinter.Menu(self.menusettings,tearoff=0,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
-        self.submenucolors.add_command(label="Line color",command=self.setlinecolor)
-        self.submenucolors.add_command(label="Label color",command=self.setlabelcolor)
-        self.submenucolors.add_command(label="Grid color",command=self.setgridcolor)
-        self.submenucolors.add_command(label="Axis color",command=self.setaxiscolor)
-        self.submenucolors.add_command(label="Plot background color",command=self.setplotbackgroundcolor)
-        self.submenucolors.add_command(label="Background color",command=self.setbackgroundcolor)
-        self.menusettings.add_cascade(label="Set colors", menu=self.submenucolors)
-        self.menusettings.add_command(label="Line thickness", command=self.setlinethickness)
-        self.menusettings.add_command(label="Font size",command=self.setfontsize)
-        self.menusettings.add_separator()
-        self.menusettings.add_checkbutton(label="x y plot", onvalue=1, offvalue=0, variable=self.xymode, command=self.update)
-        self.menusettings.add_checkbutton(label="polar plot (experimental)", onvalue=1, offvalue=0, variable=self.polarmode, command=self.update)
-        self.menusettings.add_checkbutton(label="3D line plot (experimental)", onvalue=1, offvalue=0, variable=self.line3dmode, command=self.update)
-        self.menusettings.add_checkbutton(label="3D surface plot (experimental)", onvalue=1, offvalue=0, variable=self.surface3dmode, command=self.update)
-        self.menubar.add_cascade(label="Settings",menu=self.menusettings)
-        self.menuexamples=tkinter.Menu(self.menubar,tearoff=0,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
-        self.menuexamples.add_command(label="Sinc",command=lambda: self.plotfunction("sinc(x)","-6","6",False,False,False,False))
-        self.menuexamples.add_command(label="Wavelet",command=lambda: self.plotfunction("exp(-x**2)*sin(pi*x*4)","-e","e",False,False,False,False))
-        self.menuexamples.add_command(label="Oscillation",command=lambda: self.plotfunction("(x>0)*exp(-x/3)*sin(2*pi*x)","-1","10",False,False,False,False))
-        self.menuexamples.add_command(label="Polynomial",command=lambda: self.plotfunction("x**3-15*x+3","-5","5",False,False,False,False))
-        self.menuexamples.add_command(label="Beat frequency",command=lambda: self.plotfunction("sin(x)+sin(1.1*x)","-pi*20","pi*20",False,False,False,False))
-        self.menuexamples.add_command(label="Catenary",command=lambda: self.plotfunction("2*cosh(x/2)","-2","2",False,False,False,False))
-        self.menuexamples.add_command(label="Phase control",command=lambda: self.plotfunction("((x%1)>.3)*sin(pi*x)","-2","2",False,False,False,False))
-        self.menuexamples.add_separator()
-        self.menuexamples.add_command(label="Lissajous",command=lambda: self.plotfunction("sin(3*x),cos(5*x)","-pi","pi",True,False,False,False))
-        self.menuexamples.add_separator()
-        self.menuexamples.add_command(label="Polar rose",command=lambda: self.plotfunction("2*sin(4*x)","0","pi*2",False,True,False,False))
-        self.menuexamples.add_separator()
-        self.menuexamples.add_command(label="3D lissajous",command=lambda: self.plotfunction("cos(x),-sin(x/3),sin(x)","-pi*3","pi*3",False,False,True,False))
-        self.menuexamples.add_command(label="3D spiral",command=lambda: self.plotfunction("x*cos(x),x*sin(x),sqrt(x)","0","pi*12",False,False,True,False))
-        self.menuexamples.add_command(label="3D wave",command=lambda: self.plotfunction("sin(6*x)*exp(-x**2/20),cos(6*x)*exp(-x**2/20),x","-10","10",False,False,True,False))
-        self.menuexamples.add_command(label="3D sphere",command=lambda: self.plotfunction("sqrt(100-x**2)*sin(6*x),sqrt(100-x**2)*cos(6*x),x","-10","10",False,False,True,False))
-        self.menuexamples.add_separator()
-        self.menuexamples.add_command(label="3D surface sinc",command=lambda: self.plotfunction("sinc(sqrt(x**2+y**2))","-3","3",False,False,False,True))
-        self.menuexamples.add_command(label="3D surface dome",command=lambda: self.plotfunction("-2*cosh(sqrt(x**2+y**2)/2)","-1","1",False,False,False,True))
-        self.menuexamples.add_command(label="3D surface wave",command=lambda: self.plotfunction("sin(x)*cos(y)","-pi","pi",False,False,False,True))
-        self.menubar.add_cascade(label="Examples",menu=self.menuexamples)
-        self.menuranges=tkinter.Menu(self.menubar,tearoff=0,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
-        self.menuranges.add_command(label="-1.0 .. 1.0",command=lambda: self.setrange("-1.0","1.0"))
-        self.menuranges.add_command(label="0 .. 1.0",command=lambda: self.setrange("0","1.0"))
-        self.menuranges.add_command(label="-10.0 .. 10.0",command=lambda: self.setrange("-10.0","10.0"))
-        self.menuranges.add_command(label="0 .. 10.0",command=lambda: self.setrange("0","10.0"))
-        self.menuranges.add_command(label="-pi .. pi",command=lambda: self.setrange("-pi","pi"))
-        self.menuranges.add_command(label="-2.*pi .. 2*pi",command=lambda: self.setrange("-2.0*pi","2.0*pi"))
-        self.menubar.add_cascade(label="X ranges",menu=self.menuranges)
-        self.menucolorpreset=tkinter.Menu(self.menubar,tearoff=0,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
-        self.menucolorpreset.add_command(label="Greys",command=lambda: self.presetcolor())
-        self.menucolorpreset.add_command(label="Blues",command=lambda: self.presetcolor(linecolor="#666eff",axiscolor="#2671e8",labelcolor="#2671e8", \
-            gridcolor="#462ab4",plotbackgroundcolor="#10100b",backgroundcolor="#000000", colormap=cm.Blues_r))
-        self.menucolorpreset.add_command(label="Greens",command=lambda: self.presetcolor(linecolor="#49ff3c",axiscolor="#bcd308",labelcolor="#bcd308", \
-            gridcolor="#bcd308",plotbackgroundcolor="#303030",backgroundcolor="#303030", colormap=cm.Greens_r))
-        self.menucolorpreset.add_command(label="Reds",command=lambda: self.presetcolor(linecolor="#e36853",axiscolor="#d15e31",labelcolor="#d15e31", \
-            gridcolor="#a92c2c",plotbackgroundcolor="#000000",backgroundcolor="#2c080e", colormap=cm.Reds_r))
-        self.menucolorpreset.add_command(label="Blue on white",command=lambda: self.presetcolor(linecolor="#03007B",axiscolor="#6967CC",labelcolor="#6967CC", \
-            gridcolor="#9D9BD5",plotbackgroundcolor="#FFFFFF",backgroundcolor="#D0CFEE", colormap=cm.Blues))
-        self.menubar.add_cascade(label="Color presets",menu=self.menucolorpreset)
-        self.config(menu=self.menubar)        
-        
-        
-        # ttk styles 
-        self.stylebutton=ttk.Style()
-        self.stylebutton.configure("TButton",font=("FreeSans",11,"bold"),background="#A0A0A0",foreground="#000000")
-        self.stylelabel=ttk.Style()
-        self.stylelabel.configure("TLabel",font=("FreeSans",11,"bold"),background="#A0A0A0",foreground="#000000")
-        self.styleframe=ttk.Style()
-        self.styleframe.configure("TFrame",font=("FreeSans",11,"bold"),background="#A0A0A0",foreground="#000000")
-               
-        # Frames - ttk Tkinter
-        self.framecontrols=ttk.Frame(master=self)
-        self.framecontrols.rowconfigure(0, weight = 1)
-        self.framecontrols.columnconfigure(0, weight = 1)
-        self.framecontrols.columnconfigure(1, weight = 1)
-        self.framecontrols.columnconfigure(2, weight = 1)
-        self.framecontrols.columnconfigure(3, weight = 1)
-        self.framecontrols.columnconfigure(4, weight = 1)
-        self.framecontrols.columnconfigure(5, weight = 1)
-        self.frameentries=ttk.Frame(master=self)
-        self.frameentries.rowconfigure(0, weight = 1)
-        self.frameentries.columnconfigure(0, weight = 0)
-        self.frameentries.columnconfigure(1, weight = 0)
-        self.frameentries.columnconfigure(2, weight = 3)
-        self.framefunbuttons=ttk.Frame(master=self)
-        self.framefunbuttons.rowconfigure(0, weight = 1)
-        
-        # entries - ttk
-        self.entryxstart=tkinter.Entry(self.frameentries, width=14,font=("FreeMono",13,"bold"),insertwidth=2)
-        self.entryxstart.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
-        self.entryxstop=tkinter.Entry(self.frameentries, width=14,font=("FreeMono",13,"bold"),insertwidth=2)
-        self.entryxstop.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
-        self.entryexpr =tkinter.Entry(self.frameentries, width=45,font=("FreeMono",13,"bold"),insertwidth=2)
-        self.entryexpr.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
-        self.entryexpr.insert(tkinter.END, self.initexpr)
-        
-        # labels - ttk
-        self.label_xstart=ttk.Label(master=self.frameentries,text="Start")
-        self.label_xstop=ttk.Label(master=self.frameentries,text="Stop")
-        self.label_expr=ttk.Label(master=self.frameentries,text="Expression f(x) = ")
-        
-        # buttons - ttk
-        self.button_quit = ttk.Button(master=self.framecontrols, width=13, text="Quit", command=self.destroy)
-        self.button_plot = ttk.Button(master=self.framecontrols, width=13, text="Plot", command=self.update)
-        self.button_zoomout=ttk.Button(master=self.framecontrols, width=13, text="Zoom out", command=self.zoomout)
-        self.button_zoomin=ttk.Button(master=self.framecontrols, width=13, text="Zoom in", command=self.zoomin)
-        self.button_panleft=ttk.Button(master=self.framecontrols, width=13, text="<<", command=self.panleft)
-        self.button_panright=ttk.Button(master=self.framecontrols, width=13, text=">>", command=self.panright)            
-        
-        
-        # align widgets using grid() - ttk
-        # canvas
-        self.canvas.get_tk_widget().grid(row = 0, column = 0, sticky="WENS")
-        # frame for function buttons
-        self.framefunbuttons.grid(row=1,column=0, sticky="WENS")
-        # frame for entries and labels
-        self.frameentries.grid(row=2,column=0, sticky="WENS")
-        self.label_xstart.grid(row=1,column=0, padx=10, sticky="W")
-        self.label_xstop.grid(row=1,column=1, padx=10, sticky="W")
-        self.label_expr.grid(row=1,column=2, padx=10, sticky="W")
-        self.entryxstart.grid(row=2, column=0, sticky="W")
-        self.entryxstop.grid(row=2, column=1, sticky="W")
-        self.entryexpr.grid(row = 2, column = 2, sticky="WENS")
-        # frame for control buttons
-        self.framecontrols.grid(row = 3, column = 0, sticky="WENS")
-        self.button_quit.grid(row = 0, column = 0, sticky="WENS")
-        self.button_panleft.grid(row = 0, column = 1, sticky="WENS")
-        self.button_zoomout.grid(row = 0, column = 2, sticky="WENS")
-        self.button_zoomin.grid(row = 0, column = 3, sticky="WENS")
-        self.button_panright.grid(row = 0, column = 4, sticky="WENS")
-        self.button_plot.grid(row = 0, column = 5, sticky="WENS")
-        
-        # define function buttons, align using grid() and set columnconfigure
-        mathfunctions=("sin","cos","tan","sinc","sinh","cosh","tanh","exp","log","log10","sign","sqrt")
-        for n,fun in enumerate(mathfunctions):
-            b=ttk.Button(master=self.framefunbuttons, width=6, text=fun,
-                    command=lambda fun=fun: self.insertfunction(fun) )
-            b.grid(row=0, column=n, sticky="WENS")
-            self.framefunbuttons.columnconfigure(n, weight = 1)
-        
-        
-        # keyboard events binding
-        self.bind('<KeyRelease>',self.key_released )
-        
-        # fill in values for start and stop
-        self.updatestartstoptxtbox()
-        
-        # set colors        
-        self.presetcolor()   
+        self.xymode = self.newsetting(False) # mode voor xy plot
+        self.polarmode = self.newsetting(False) # mode voor polar plot
+        self.line3dmode = self.newsetting(False) # mode voor 3d line plot
+        self.surface3dmode = self.newsetting(False) # mode voor 3d surface plot
+        self.complexmode = self.newsetting(False) # mode for domain coloring of complex function f(z)
+        self.Ncomplex = 600 # number of pixels per side of the domain coloring image
+        self.odemode = self.newsetting(False) # mode for differential equation y'=f(x,y)
+        self.odeadaptive = self.newsetting(False) # adaptive step size for differential equation
+        self.odey0txt = "linspace(-2,2,21)" # expression for initial values y(xstart) of the solutions
+        self.odetolerance = 1E-6 # relative tolerance for adaptive step size
+        self.odex = None # x values of the solutions of the differential equation
+        self.Nfield = 25 # number of direction field lines in x direction
+        self.definitions = {} # user defined functions, name: Definedfunction
+        self.gridkey = None # inputs used to generate self.t, self.v and self.w
+        self.datax = None # x values of imported data, None when x is the sample index
+        self.datay = None # y values of imported data, None when no data imported
+        self.datacolor = "#FFA500" # color used for imported data overlay
+        self.Ndisplay = 4000 # max. number of min/max buckets when displaying imported data
+        self.precision = self.newsetting("float64") # numpy dtype used to evaluate the expression
+        self.fast3dmode = self.newsetting(False) # use fast projected view for 3d line plot
+        self.fast3dpoints = None # (N,3) ndarray of 3d line points scaled to cube -1..1
+        self.fast3dline = None # LineCollection showing the projected 3d line
+        self.fast3dbox = None # LineCollection showing the projected edges of the cube
+        self.elevation = 30.0 # view angles in degrees for fast 3d line view
+        self.azimuth = -60.0
+        self.densitymode = self.newsetting(False) # xy plot shown as density image instead of line
+        self.densitylog = self.newsetting(True) # logarithmic color scale for density image
+        self.Nchunk = 2**20 # number of samples binned at once for density image
+        self.proxy = None # Chebyshevproxy of f(x), None when no approximant was built
+        self.proxyinputs = None # expression, definitions and precision the approximant was built for
+        self.proxymode = self.newsetting(False) # plot f(x) using the approximant when it covers the interval
+        self.logx = self.newsetting(False) # logarithmic x axis for plot of f(x), x sampled using geomspace
+        self.logy = self.newsetting(False) # logarithmic y axis for plot of f(x)
+        self.setcolors()
     
+    # make a setting with value, get() and set() like tkinter.BooleanVar and tkinter.StringVar
+    # the Plotter application uses Tkinter variables for the menus
+    def newsetting(self,value):
+        return(Setting(value))
     
-    # add function to expression when a function button is clicked
-    def insertfunction(self,fun):
-        self.entryexpr.insert( tkinter.INSERT, fun + "(" )
-        self.entryexpr.insert( tkinter.END, ")" )
-           
-        
-    # zoom out plot, update values for tstart and tstop
-    # remake plot with the new values
-    def zoomout(self):        
-        self.tspan=self.tstop-self.tstart
-        self.tstart=self.tstart-self.tspan
-        self.tstop=self.tstop+self.tspan     
-        self.updatestartstoptxtbox()
-        self.update()
-        
-        
-    # zoom in plot, update values for tstart and tstop
-    # remake plot with the new values
-    def zoomin(self):
-        self.tspan=self.tstop-self.tstart
-        self.tstart=self.tstart+self.tspan/3
-        self.tstop=self.tstop-self.tspan/3     
-        self.updatestartstoptxtbox()
-        self.update()
+    # set colors used for the plot
+    def setcolors(self,linecolor="#FFFFFF",axiscolor="#B0B0B0",labelcolor="#B0B0B0", \
+        gridcolor="#B0B0B0",plotbackgroundcolor="#303030",backgroundcolor="#303030", colormap=cm.Greys_r):
+        self.linecolor = linecolor
+        self.axiscolor = axiscolor
+        self.labelcolor = labelcolor
+        self.gridcolor = gridcolor
+        self.plotbackgroundcolor = plotbackgroundcolor
+        self.backgroundcolor = backgroundcolor
+        self.colormap=colormap
     
-    # pan left plot, update values for tstart and tstop
-    # remake plot with the new values
-    def panleft(self):
-        self.tspan=self.tstop-self.tstart
-        self.tstart=self.tstart-self.tspan/4
-        self.tstop=self.tstop-self.tspan/4      
-        self.updatestartstoptxtbox()
-        self.update()
-
-    # pan right plot, update values for tstart and tstop
-    # remake plot with the new values
-    def panright(self):
-        self.tspan=self.tstop-self.tstart
-        self.tstart=self.tstart+self.tspan/4
-        self.tstop=self.tstop+self.tspan/4   
-        self.updatestartstoptxtbox()
-        self.update()
+    # generate numpy array self.t represnting x waarden for function
+    # calculate values for new plot in numpy array self.y for self.txt, self.tstart and self.tstop
+    # raises SyntaxError, NameError or TypeError when the expression is not correct
+    def evaluate(self):
+        if ("y" in self.txt) and not self.odemode.get():
+            self.surface3dmode.set(True)        
+        if "z" in self.txt:
+            self.complexmode.set(True)
+        
+        logx=self.logxactive()
+        if logx and ((self.tstart<=0) or (self.tstop<=0)):
+            raise ValueError("Interval should be positive for logarithmic x axis")
+        
+        # arrays with x (and y) values are only generated again when the grid changes
+        # so results of user defined functions cached for these arrays stay valid
+        gridkey=(self.tstart,self.tstop,self.N,self.Ncomplex,self.precision.get(),self.complexmode.get(),self.surface3dmode.get(),self.odemode.get(),logx)
+        if gridkey!=self.gridkey:
+            self.gridkey=gridkey
+            if self.odemode.get():
+                self.t = linspace( self.tstart , self.tstop , self.N , dtype=self.precision.get() )
+            elif self.complexmode.get():
+                # own resolution, an image needs more points than a line
+                self.t = linspace( self.tstart , self.tstop , self.Ncomplex , dtype=self.precision.get() )
+            elif self.surface3dmode.get():
+                Number=int(sqrt(self.N))
+                self.t = linspace( self.tstart , self.tstop , Number , dtype=self.precision.get() )
+                self.v,self.w = meshgrid(self.t, self.t)
+            elif logx:
+                # x values evenly spaced on logarithmic x axis, same resolution for every decade
+                self.t = geomspace( self.tstart , self.tstop , self.N , dtype=self.precision.get() )
+            else:
+                # numpy array self.t generated using numpy.linspace() in the selected precision
+                self.t = linspace( self.tstart , self.tstop , self.N , dtype=self.precision.get() )
+        
+        # numpy array self.y generated by applying evalexpression() on 
+        # numpy array t
+        if self.odemode.get():
+            self.y = self.solveode()
+        elif self.complexmode.get():
+            self.y = self.domaincoloring( self.t )
+        elif self.surface3dmode.get():
+            self.y = self.evalexpression( self.v , self.w )
+        elif self.proxyvalid():
+            self.y = self.proxy( self.t ).astype(self.t.dtype)
+        else:
+            self.y = self.evalexpression( self.t )
         
-           
+        # when 1 "," is present in the function self.txt it contains 2 functions for xy plot    
+        # when 2 ","are present it is an 3D line plot
+        match self.txt.count(","):
+            case 0:
+                self.xymode.set(False)
+                self.line3dmode.set(False)
+            case 1:
+                self.xymode.set(True)
+                self.line3dmode.set(False)
+                self.surface3dmode.set(False)
+                self.complexmode.set(False)
+            case 2:
+                self.xymode.set(False)
+                self.line3dmode.set(True)
+                self.surface3dmode.set(False)
+                self.complexmode.set(False)
+    
+    # is x sampled using geomspace and shown on a logarithmic x axis
+    # only for a plot of f(x), the other types of plot keep linear axes
+    def logxactive(self):
+        modes=(self.odemode,self.complexmode,self.surface3dmode,self.polarmode)
+        return(self.logx.get() and (self.txt.count(",")==0) and not any([mode.get() for mode in modes]))
+    
+    # can self.proxy be used instead of the expression for the current plot of f(x)
+    def proxyvalid(self):
+        if (not self.proxymode.get()) or (self.proxy is None):
+            return(False)
+        txt,definitions,precision=self.proxyinputs
+        return((txt==self.txt) and (definitions is self.definitions) and (precision==self.precision.get()) \
+            and (self.proxy.a<=self.tstart) and (self.tstop<=self.proxy.b))
+    
     # round floating point value and convert to scietific notation, output is str
     def roundvaluestr(self, x, decimals ):
         sci=f"{x:e}"
@@ -306,28 +220,66 @@ class Plotter(tkinter.Tk):
         else:
             scistr=f"{mantissa}"
         return scistr
-    
-        
-    # update values of tstart en tstop entry boxes
-    def updatestartstoptxtbox(self):
-        self.entryxstart.delete(0, 'end')
-        self.entryxstart.insert(tkinter.END,self.roundvaluestr(self.tstart,8))
-        self.entryxstop.delete(0, 'end')
-        self.entryxstop.insert(tkinter.END,self.roundvaluestr(self.tstop,8))
-        
 
-    # evaluate expression self.txt with values in ndarray x and optionally y
-    def evalexpression(self,x,y=0):
-        waarde=eval(self.txt)
+    # evaluate expression self.txt with values in ndarray x and optionally y and complex z
+    # user defined functions in self.definitions can be used in the expression
+    def evalexpression(self,x,y=0,z=0):
+        namespace=dict(self.definitions)
+        namespace.update(x=x,y=y,z=z)
+        waarde=eval(self.txt,self.evalglobals,namespace)
         return waarde
 
-    
+    # evaluate expression self.txt for a single value x in the selected precision
+    # used by the numerical methods
+    def evalscalar(self,x):
+        return self.evalexpression(dtype(self.precision.get()).type(x))
+
+    # estimate the error caused by the selected precision
+    # the expression is evaluated again in the next higher precision on a few
+    # points spread over self.t, maximum difference relative to maximum value is returned
+    # returns None if no higher precision is available
+    def precisionerror(self,Nspot=64):
+        match self.precision.get():
+            case "float32":
+                higher=float64
+            case "float64" if finfo(longdouble).eps<finfo(float64).eps:
+                higher=longdouble
+            case _:
+                return(None)
+        Number=len(self.t)
+        if self.logxactive():
+            t=geomspace( self.tstart , self.tstop , Number , dtype=higher )
+        else:
+            t=linspace( self.tstart , self.tstop , Number , dtype=higher )
+        if self.surface3dmode.get():
+            v,w=meshgrid(t, t)
+            fullshape=v.shape
+            index=linspace(0, Number*Number-1, Nspot).astype(int)
+            values=self.evalexpression( v.ravel()[index] , w.ravel()[index] )
+        else:
+            fullshape=t.shape
+            index=linspace(0, Number-1, Nspot).astype(int)
+            values=self.evalexpression( t[index] )
+        # self.y and values can be a tuple of functions for xy and 3D line plots
+        if type(self.y) is not tuple:
+            lows,highs=(self.y,),(values,)
+        else:
+            lows,highs=self.y,values
+        error=0.0
+        for low,high in zip(lows,highs):
+            low=broadcast_to(asarray(low,dtype=higher),fullshape).ravel()[index]
+            high=broadcast_to(asarray(high,dtype=higher),low.shape)
+            scale=nanmax(absolute(high))
+            if scale>0:
+                error=fmax(error,float(nanmax(absolute(low-high))/scale))
+        return(error)
+
     # make a plot of function f(x) 
     def plotfx(self,fillstart=0.0,fillstop=1.0,fillshow=False):
         
         if type(self.y) is not ndarray:
             waarde=self.y
-            self.y=empty(self.N)
+            self.y=empty(self.N,dtype=self.t.dtype)
             self.y.fill(waarde)
         
         self.fig.delaxes(self.ax) 
@@ -339,6 +291,11 @@ class Plotter(tkinter.Tk):
         # values in self.y plotted in fucntion of values self.t
         self.line = self.ax.plot(self.t, self.y, color=self.linecolor, linewidth=self.linethickness)
         
+        # overlay imported data, decimated to the visible interval
+        if self.datay is not None:
+            xd,yd=self.decimate(self.datax,self.datay,self.tstart,self.tstop,self.Ndisplay)
+            self.ax.plot(xd, yd, color=self.datacolor, linewidth=1)
+        
         # set colors and text on the plot
         title="f(x)="+self.txt
         self.ax.set_ylabel("f(x)", fontsize = self.fontsize) # Y label
@@ -357,6 +314,10 @@ class Plotter(tkinter.Tk):
         self.ax.spines['right'].set_color(self.axiscolor)
         self.ax.xaxis.set_tick_params(labelsize=self.fontsize)
         self.ax.yaxis.set_tick_params(labelsize=self.fontsize)
+        if self.logxactive():
+            self.ax.set_xscale("log")
+        if self.logy.get():
+            self.ax.set_yscale("log", nonpositive="mask") # values <= 0 are not shown
         
         # when calculating integral
         if fillshow:
@@ -364,7 +325,175 @@ class Plotter(tkinter.Tk):
         
         # update canvas
         self.canvas.draw()
+
+    # plot complex function f(z) as domain coloring image
+    # self.y contains the rgb image calculated by self.domaincoloring()
+    def plotcomplex(self):
+        # matplotlib plot deleted 
+        self.fig.delaxes(self.ax)
+        
+        # new rectilinear plot generated on Figure object          
+        self.ax = self.fig.add_subplot(projection='rectilinear') 
+        self.ax.imshow(self.y, origin='lower', extent=(self.tstart,self.tstop,self.tstart,self.tstop), \
+            interpolation='nearest')
+        
+        # set colors and text on the plot
+        title="f(z)="+self.txt
+        self.ax.set_ylabel("Im z", fontsize = self.fontsize) # Y label
+        self.ax.set_xlabel("Re z", fontsize = self.fontsize) # X label
+        self.ax.set_title(title,fontweight="bold", size=self.fontsize, color=self.linecolor) # Title
+        self.fig.set_facecolor(self.backgroundcolor)
+        self.ax.xaxis.label.set_color(self.labelcolor)
+        self.ax.yaxis.label.set_color(self.labelcolor)
+        self.ax.tick_params(axis='x', colors=self.axiscolor)
+        self.ax.tick_params(axis='y', colors=self.axiscolor)
+        self.ax.spines['left'].set_color(self.axiscolor)
+        self.ax.spines['bottom'].set_color(self.axiscolor)
+        self.ax.spines['top'].set_color(self.axiscolor)
+        self.ax.spines['right'].set_color(self.axiscolor)
+        self.ax.xaxis.set_tick_params(labelsize=self.fontsize)
+        self.ax.yaxis.set_tick_params(labelsize=self.fontsize)
+        
+        # update canvas
+        self.canvas.draw()
+
+    # evaluate f(z) on the grid z = x + j*y with x and y values out of t
+    # the grid is evaluated per block of rows of max. self.Nchunk points, so memory use stays limited
+    # phase of f(z) gives hue, magnitude gives brightness (0 black, infinite full brightness)
+    # returns rgb image as (len(t),len(t),3) ndarray of uint8
+    def domaincoloring(self,t):
+        Number=len(t)
+        rgb=empty((Number,Number,3),dtype=uint8)
+        Nrows=int(clip(self.Nchunk//Number,1,Number))
+        for i in range(0,Number,Nrows):
+            v,w=meshgrid(t, t[i:i+Nrows])
+            values=broadcast_to(self.evalexpression( v , w , v+1j*w ),v.shape)
+            hsv=empty(v.shape+(3,))
+            hsv[...,0]=nan_to_num((angle(values)/(2*pi))%1.0)
+            hsv[...,1]=1.0
+            hsv[...,2]=nan_to_num(arctan(absolute(values))*(2/pi),nan=0.0)
+            rgb[i:i+Nrows]=(hsv_to_rgb(hsv)*255).astype(uint8)
+        return(rgb)
+
+    # plot direction field of y'=f(x,y) and the solutions for all initial values
+    # self.y contains the solutions, one column per initial value, at x values self.odex
+    def plotode(self):
+        # matplotlib plot deleted 
+        self.fig.delaxes(self.ax)
         
+        # new rectilinear plot generated on Figure object          
+        self.ax = self.fig.add_subplot(projection='rectilinear') 
+        
+        # visible y range follows from the initial values
+        y0=self.y[0]
+        ylow,yhigh=float(nanmin(y0)),float(nanmax(y0))
+        if ylow==yhigh:
+            ylow,yhigh=ylow-1.0,yhigh+1.0
+        ylow,yhigh=ylow-(yhigh-ylow)*0.1,yhigh+(yhigh-ylow)*0.1
+        
+        # direction field: slopes on a grid evaluated in one call, drawn as lines of equal length
+        xspan=self.tstop-self.tstart
+        yspan=yhigh-ylow
+        X,Y=meshgrid(linspace(self.tstart,self.tstop,self.Nfield),linspace(ylow,yhigh,int(self.Nfield*0.75)))
+        with errstate(all="ignore"):
+            slopes=broadcast_to(self.evalexpression(X,Y),X.shape)
+            length=sqrt((1/xspan)**2+(slopes/yspan)**2)*self.Nfield/0.7
+        self.ax.quiver(X, Y, ma.masked_invalid(1/length), ma.masked_invalid(slopes/length), angles='xy', \
+            scale_units='xy', scale=1, pivot='mid', headwidth=0, headlength=0, headaxislength=0, color=self.gridcolor)
+        
+        # solutions as one LineCollection, solutions going to infinity end at the last finite value
+        lines=LineCollection([column_stack((self.odex,where(isfinite(yy),yy,nan))) for yy in self.y.T], \
+            colors=self.linecolor, linewidths=self.linethickness)
+        self.ax.add_collection(lines)
+        self.ax.set_xlim(self.tstart,self.tstop)
+        self.ax.set_ylim(ylow,yhigh)
+        
+        # set colors and text on the plot
+        title="y'="+self.txt
+        self.ax.set_ylabel("y", fontsize = self.fontsize) # Y label
+        self.ax.set_xlabel("x", fontsize = self.fontsize) # X label
+        self.ax.grid(color = self.gridcolor, linewidth = 0.5)
+        self.ax.set_title(title,fontweight="bold", size=self.fontsize, color=self.linecolor) # Title
+        self.ax.set_facecolor(self.plotbackgroundcolor)
+        self.fig.set_facecolor(self.backgroundcolor)
+        self.ax.xaxis.label.set_color(self.labelcolor)
+        self.ax.yaxis.label.set_color(self.labelcolor)
+        self.ax.tick_params(axis='x', colors=self.axiscolor)
+        self.ax.tick_params(axis='y', colors=self.axiscolor)
+        self.ax.spines['left'].set_color(self.axiscolor)
+        self.ax.spines['bottom'].set_color(self.axiscolor)
+        self.ax.spines['top'].set_color(self.axiscolor)
+        self.ax.spines['right'].set_color(self.axiscolor)
+        self.ax.xaxis.set_tick_params(labelsize=self.fontsize)
+        self.ax.yaxis.set_tick_params(labelsize=self.fontsize)
+        
+        # update canvas
+        self.canvas.draw()
+
+    # solve y'=f(x,y) for all initial values at once, y is an ndarray with one value per solution
+    # returns solutions as (number of x values, number of initial values) ndarray, x values in self.odex
+    def solveode(self):
+        # initial values are entered in the window, never taken from a render server request
+        y0=asarray(eval(self.odey0txt,globals()),dtype=self.t.dtype).ravel()
+        f=lambda x,y: broadcast_to(self.evalexpression(x,y),y.shape)
+        with errstate(all="ignore"): # solutions going to infinity are allowed
+            if self.odeadaptive.get():
+                self.odex,Y=self.dormandprince(f,self.tstart,self.tstop,y0,self.odetolerance,self.N)
+            else:
+                self.odex=self.t
+                Y=self.rungekutta(f,self.t,y0)
+        return(Y)
+
+    # classic 4th order Runge-Kutta with the x values of x as steps
+    # every step evaluates f 4 times for all solutions together
+    def rungekutta(self,f,x,y0):
+        Y=empty((len(x),len(y0)),dtype=y0.dtype)
+        Y[0]=y0
+        y=y0
+        for i in range(len(x)-1):
+            h=x[i+1]-x[i]
+            k1=f(x[i],y)
+            k2=f(x[i]+h/2,y+h/2*k1)
+            k3=f(x[i]+h/2,y+h/2*k2)
+            k4=f(x[i]+h,y+h*k3)
+            y=y+h/6*(k1+2*k2+2*k3+k4)
+            Y[i+1]=y
+        return(Y)
+
+    # Dormand-Prince 5(4) Runge-Kutta with adaptive step size, one step size for all solutions
+    # the largest relative error of the finite solutions determines the step size
+    # solutions growing beyond 1000 times the largest initial value are stopped (nan),
+    # otherwise a solution going to infinity would make the step size go to zero
+    # max. Nmax steps, returns x values and solutions
+    def dormandprince(self,f,xstart,xstop,y0,tolerance,Nmax):
+        a=((),(1/5,),(3/40,9/40),(44/45,-56/15,32/9),(19372/6561,-25360/2187,64448/6561,-212/729), \
+            (9017/3168,-355/33,46732/5247,49/176,-5103/18656),(35/384,0,500/1113,125/192,-2187/6784,11/84))
+        c=(0,1/5,3/10,4/5,8/9,1,1)
+        e=(71/57600,0,-71/16695,71/1920,-17253/339200,22/525,-1/40) # 5th minus 4th order weights
+        xs=[xstart]
+        Ys=[y0]
+        x=xstart
+        y=y0
+        h=(xstop-xstart)/100
+        bound=1E3*(1+nanmax(absolute(y0)))
+        while (x<xstop) and (len(xs)<Nmax):
+            h=float(clip(h,0,xstop-x))
+            k=[f(x,y)]
+            for i in range(1,7):
+                yi=y+h*sum([aij*kj for aij,kj in zip(a[i],k)],axis=0)
+                k.append(f(x+c[i]*h,yi))
+            ynew=y+h*sum([aij*kj for aij,kj in zip(a[6],k)],axis=0)
+            error=absolute(h*sum([ei*ki for ei,ki in zip(e,k)],axis=0))/(tolerance*(1+absolute(ynew)))
+            error=error[isfinite(error)]
+            errornorm=float(error.max()) if len(error)>0 else 0.0
+            if errornorm<=1.0: # step accepted
+                x=x+h
+                y=where(absolute(ynew)<=bound,ynew,nan)
+                xs.append(x)
+                Ys.append(y)
+            h=h*float(clip(0.9*errornorm**-0.2 if errornorm>0 else 5.0,0.2,5.0))
+        return(array(xs,dtype=y0.dtype),array(Ys))
+
     # plot y(t) in function of x(t)
     def plotxy(self):
         
@@ -379,18 +508,27 @@ class Plotter(tkinter.Tk):
                 
         if type(xx) is not ndarray:
             waarde=xx
-            xx=empty(self.N)
+            xx=empty(self.N,dtype=self.t.dtype)
             xx.fill(waarde)
             
         if type(yy) is not ndarray:
             waarde=yy
-            yy=empty(self.N)
+            yy=empty(self.N,dtype=self.t.dtype)
             yy.fill(waarde)
 
         
         # plot generated using matplotlib plot() function
         # values in yy plotted in function off xx
-        self.line = self.ax.plot(xx, yy, color=self.linecolor, linewidth=self.linethickness)
+        # or number of samples per pixel shown as image in density view
+        if self.densitymode.get():
+            width=int(clip(self.ax.bbox.width,1,None))
+            height=int(clip(self.ax.bbox.height,1,None))
+            counts,extent=self.densityhistogram(xx,yy,width,height)
+            norm=LogNorm() if self.densitylog.get() else Normalize()
+            self.ax.imshow(ma.masked_equal(counts,0), origin='lower', extent=extent, aspect='auto', \
+                interpolation='nearest', cmap=self.colormap, norm=norm)
+        else:
+            self.line = self.ax.plot(xx, yy, color=self.linecolor, linewidth=self.linethickness)
        
         # set coloers and text on plot
         txts=self.txt.split(",") # seperate 2 strings
@@ -399,37 +537,124 @@ class Plotter(tkinter.Tk):
         self.ax.set_xlabel(txts[0], fontsize = self.fontsize) # X label
         self.ax.grid(color = self.gridcolor, linewidth = 0.5)
         self.ax.set_title(title,fontweight="bold", size=self.fontsize, color=self.linecolor) # Title
-        self.ax.set_facecolor(self.plotbackgroundcolor)
+        self.ax.set_facecolor(self.plotbackgroundcolor)
+        self.fig.set_facecolor(self.backgroundcolor)
+        self.ax.xaxis.label.set_color(self.labelcolor)
+        self.ax.yaxis.label.set_color(self.labelcolor)
+        self.ax.tick_params(axis='x', colors=self.axiscolor)
+        self.ax.tick_params(axis='y', colors=self.axiscolor)
+        self.ax.spines['left'].set_color(self.axiscolor)
+        self.ax.spines['bottom'].set_color(self.axiscolor)
+        self.ax.spines['top'].set_color(self.axiscolor)
+        self.ax.spines['right'].set_color(self.axiscolor)
+        self.ax.xaxis.set_tick_params(labelsize=self.fontsize)
+        self.ax.yaxis.set_tick_params(labelsize=self.fontsize)
+        
+        # canvas and toolbar updated
+        self.canvas.draw()
+
+    # count samples (xx,yy) per pixel in a 2D histogram of width x height pixels
+    # samples are handled in chunks of self.Nchunk so memory use does not grow with the number of samples
+    # returns counts (height,width) and extent (xmin,xmax,ymin,ymax) for imshow()
+    def densityhistogram(self,xx,yy,width,height):
+        xx=xx.ravel()
+        yy=yy.ravel()
+        chunks=range(0,len(xx),self.Nchunk)
+        
+        # first pass: range of the finite samples
+        xmin,xmax,ymin,ymax=inf,-inf,inf,-inf
+        for i in chunks:
+            x=xx[i:i+self.Nchunk]
+            y=yy[i:i+self.Nchunk]
+            ok=isfinite(x)&isfinite(y)
+            if ok.any():
+                xmin,xmax=fmin(xmin,x[ok].min()),fmax(xmax,x[ok].max())
+                ymin,ymax=fmin(ymin,y[ok].min()),fmax(ymax,y[ok].max())
+        if not isfinite(xmin):
+            return(zeros((height,width),dtype=intp),(0.0,1.0,0.0,1.0))
+        if xmax==xmin:
+            xmin,xmax=xmin-0.5,xmax+0.5
+        if ymax==ymin:
+            ymin,ymax=ymin-0.5,ymax+0.5
+        
+        # second pass: pixel index of every sample, counted using bincount()
+        counts=zeros(width*height,dtype=intp)
+        for i in chunks:
+            x=xx[i:i+self.Nchunk]
+            y=yy[i:i+self.Nchunk]
+            ok=isfinite(x)&isfinite(y)
+            ix=clip(((x[ok]-xmin)*(width/(xmax-xmin))).astype(intp),0,width-1)
+            iy=clip(((y[ok]-ymin)*(height/(ymax-ymin))).astype(intp),0,height-1)
+            counts+=bincount(iy*width+ix,minlength=width*height)
+        return(counts.reshape(height,width),(float(xmin),float(xmax),float(ymin),float(ymax)))
+
+    def plot3dsurface(self):
+        # matplotlib plot deleted
+        self.fig.delaxes(self.ax)       
+        
+        if type(self.y) is not ndarray:
+            Number=int(sqrt(self.N))
+            waarde=self.y
+            self.y=empty((Number,Number),dtype=self.t.dtype)
+            self.y.fill(waarde)
+        
+        # surface plot generated    
+        self.ax = self.fig.add_subplot(projection='3d') 
+        self.ax.plot_surface(self.v , self.w , self.y, \
+            cmap=self.colormap)
+
+        # set colors and text
+        title=self.txt
+        self.ax.xaxis.set_pane_color(self.plotbackgroundcolor)
+        self.ax.yaxis.set_pane_color(self.plotbackgroundcolor)
+        self.ax.zaxis.set_pane_color(self.plotbackgroundcolor)
+        self.ax.xaxis._axinfo['grid']['color'] = self.gridcolor
+        self.ax.yaxis._axinfo['grid']['color'] = self.gridcolor
+        self.ax.zaxis._axinfo['grid']['color'] = self.gridcolor
+        self.ax.xaxis._axinfo['axisline']['color'] = self.gridcolor
+        self.ax.yaxis._axinfo['axisline']['color'] = self.gridcolor
+        self.ax.zaxis._axinfo['axisline']['color'] = self.gridcolor
+        self.ax.set_title(title,fontweight="bold", size=self.fontsize, color=self.linecolor) # Title
+        self.ax.set_facecolor(self.backgroundcolor)
         self.fig.set_facecolor(self.backgroundcolor)
         self.ax.xaxis.label.set_color(self.labelcolor)
         self.ax.yaxis.label.set_color(self.labelcolor)
+        self.ax.zaxis.label.set_color(self.labelcolor)
         self.ax.tick_params(axis='x', colors=self.axiscolor)
         self.ax.tick_params(axis='y', colors=self.axiscolor)
-        self.ax.spines['left'].set_color(self.axiscolor)
-        self.ax.spines['bottom'].set_color(self.axiscolor)
-        self.ax.spines['top'].set_color(self.axiscolor)
-        self.ax.spines['right'].set_color(self.axiscolor)
+        self.ax.tick_params(axis='z', colors=self.axiscolor)
         self.ax.xaxis.set_tick_params(labelsize=self.fontsize)
         self.ax.yaxis.set_tick_params(labelsize=self.fontsize)
+        self.ax.zaxis.set_tick_params(labelsize=self.fontsize)
         
-        # canvas and toolbar updated
+        # canvas en toolbar updaten
         self.canvas.draw()
+
+    # plot 3D line    
+    def plot3dline(self):
+        # matplotlib plot deleted 
+        self.fig.delaxes(self.ax)    
+        self.ax = self.fig.add_subplot(projection='3d') 
         
-    def plot3dsurface(self):
-        # matplotlib plot deleted
-        self.fig.delaxes(self.ax)       
-        
-        if type(self.y) is not ndarray:
-            Number=int(sqrt(self.N))
-            waarde=self.y
-            self.y=empty((Number,Number))
-            self.y.fill(waarde)
+        # self.y is tuple of 3 numpy ndarray
+        xx,yy,zz,*other = self.y  
         
-        # surface plot generated    
-        self.ax = self.fig.add_subplot(projection='3d') 
-        self.ax.plot_surface(self.v , self.w , self.y, \
-            cmap=self.colormap)
+        if type(xx) is not ndarray:
+            waarde=xx
+            xx=empty(self.N,dtype=self.t.dtype)
+            xx.fill(waarde)
+        if type(yy) is not ndarray:
+            waarde=yy
+            yy=empty(self.N,dtype=self.t.dtype)
+            yy.fill(waarde)      
+        if type(zz) is not ndarray:
+            waarde=zz
+            zz=empty(self.N,dtype=self.t.dtype)
+            zz.fill(waarde)
 
+        # plot the line using 3 ndarrays
+        self.ax.plot(xx, yy, zz, color=self.linecolor, linewidth=self.linethickness)
+        
         # set colors and text
         title=self.txt
         self.ax.xaxis.set_pane_color(self.plotbackgroundcolor)
@@ -454,116 +679,555 @@ class Plotter(tkinter.Tk):
         self.ax.yaxis.set_tick_params(labelsize=self.fontsize)
         self.ax.zaxis.set_tick_params(labelsize=self.fontsize)
         
-        # canvas en toolbar updaten
-        self.canvas.draw()
-
-
-    # plot 3D line    
-    def plot3dline(self):
-        # matplotlib plot deleted 
-        self.fig.delaxes(self.ax)    
-        self.ax = self.fig.add_subplot(projection='3d') 
+        # canvas en toolbar updated
+        self.canvas.draw()
+
+    # 3D line drawn as projection on a rectilinear plot
+    # one matrix multiplication per frame projects all points, mouse drag rotates the view
+    # while dragging only every n-th point is drawn, full resolution on release
+    def plot3dlinefast(self):
+        # matplotlib plot deleted 
+        self.fig.delaxes(self.ax)    
+        self.ax = self.fig.add_subplot(projection='rectilinear') 
+        
+        # self.y is tuple of 3 numpy ndarray
+        xx,yy,zz,*other = self.y  
+        points=column_stack(broadcast_arrays(xx,yy,zz,self.t)[:3]).astype(float64)
+        
+        # scale every axis to -1..1 like the cube of the mplot3d plot
+        low=nanmin(points,axis=0)
+        high=nanmax(points,axis=0)
+        halfspan=(high-low)/2
+        halfspan[halfspan==0]=1.0
+        self.fast3dpoints=(points-(high+low)/2)/halfspan
+        
+        # corners and edges of the cube
+        self.boxcorners=array([[i,j,k] for i in (-1,1) for j in (-1,1) for k in (-1,1)],dtype=float64)
+        self.boxedges=array([[a,b] for a in range(8) for b in range(a+1,8) \
+            if sum(self.boxcorners[a]!=self.boxcorners[b])==1])
+        
+        self.fast3dbox=LineCollection([], colors=self.gridcolor, linewidths=0.5)
+        self.fast3dline=LineCollection([], colors=self.linecolor, linewidths=self.linethickness)
+        self.ax.add_collection(self.fast3dbox)
+        self.ax.add_collection(self.fast3dline)
+        self.ax.set_xlim(-1.8,1.8)
+        self.ax.set_ylim(-1.8,1.8)
+        self.ax.set_aspect('equal')
+        self.ax.set_axis_off()
+        
+        # set colors and text
+        title=self.txt
+        self.ax.set_title(title,fontweight="bold", size=self.fontsize, color=self.linecolor) # Title
+        self.fig.set_facecolor(self.backgroundcolor)
+        
+        self.drawfast3d()
+        
+        # canvas en toolbar updated
+        self.canvas.draw()
+
+    # columns are the screen x and y directions for self.azimuth and self.elevation
+    def viewmatrix(self):
+        a=radians(self.azimuth)
+        e=radians(self.elevation)
+        return(array([[-sin(a), -sin(e)*cos(a)],
+                      [ cos(a), -sin(e)*sin(a)],
+                      [ 0.0   ,  cos(e)       ]]))
+
+    # project points of the fast 3d line view, max. Nmax points when Nmax is given
+    def drawfast3d(self,Nmax=None):
+        points=self.fast3dpoints
+        if (Nmax is not None) and (len(points)>Nmax):
+            points=points[::int(ceil(len(points)/Nmax))]
+        view=self.viewmatrix()
+        self.fast3dline.set_segments([points@view])
+        self.fast3dbox.set_segments((self.boxcorners@view)[self.boxedges])
+        self.canvas.draw_idle()
+
+    # POLAR plot 
+    def plotpolar(self):
+        
+        if type(self.y) is not ndarray:
+            waarde=self.y
+            self.y=empty(self.N,dtype=self.t.dtype)
+            self.y.fill(waarde)
+        
+        # adapt data because matplotlib does not plot negative r values
+        # on the negative siden of the origin
+        # add pi radials for the points for which r < 0
+        # then replace r with it's absolute value
+        def modifyforpolar(r,theta): # this function adds pi to theta if r<0, then returns theta
+            if r<0:
+                theta+=pi
+            return(theta)
+        
+        # apply modifyforpolar on all values in self.t toepassen  
+        thetamod=list(map(modifyforpolar,self.y,self.t))
+        
+        # using map() take absolute value of rfor all points
+        rmod=list(map(abs,self.y))
+        
+        # matplotlib plot deleted 
+        self.fig.delaxes(self.ax)
+        
+        # create new polar plot on Figure object                  
+        self.ax = self.fig.add_subplot(projection='polar') 
+        
+        # generate plot via matplotlib plot() 
+        # plot rmod in function of thetamod 
+        self.line = self.ax.plot(thetamod, rmod, color=self.linecolor, linewidth=self.linethickness)
+        
+        # set colors and text
+        title="r(x)="+self.txt
+        self.ax.grid(color = self.gridcolor, linewidth = 0.5)
+        self.ax.set_title(title,fontweight="bold", size=self.fontsize, color=self.linecolor) # Title
+        self.ax.set_facecolor(self.plotbackgroundcolor)
+        self.fig.set_facecolor(self.backgroundcolor)
+        self.ax.xaxis.label.set_color(self.labelcolor)
+        self.ax.yaxis.label.set_color(self.labelcolor)
+        self.ax.tick_params(axis='x', colors=self.axiscolor)
+        self.ax.tick_params(axis='y', colors=self.axiscolor)
+        self.ax.xaxis.set_tick_params(labelsize=self.fontsize)
+        self.ax.yaxis.set_tick_params(labelsize=self.fontsize)
+        
+        # canvas en toolbar updated
+        self.canvas.draw()
+
+    # plot self.t and self.y without evaluating the expression again
+    def plotcurrent(self):
+        # plotten, type of plot depends on tkinter booleans self.polarmode and self.xymode
+        if self.odemode.get():
+            self.plotode()
+        elif self.complexmode.get():
+            self.plotcomplex()
+        elif self.surface3dmode.get():
+            self.plot3dsurface()
+        elif self.polarmode.get():
+            self.plotpolar()
+        elif self.xymode.get():
+            self.plotxy()
+        elif self.line3dmode.get() and self.fast3dmode.get():
+            self.plot3dlinefast()
+        elif self.line3dmode.get():
+            self.plot3dline()
+        else:
+            self.plotfx()        
+
+    # reduce samples of datay (and datax) inside interval start..stop for display
+    # when more than 2*Nmax samples are visible, they are split in at most Nmax buckets
+    # and only minimum and maximum of every bucket is kept, so peaks stay visible
+    # buckets are reshaped views, memory-mapped data is only read, never copied as a whole
+    def decimate(self,datax,datay,start,stop,Nmax):
+        Ndata=len(datay)
+        if datax is None:
+            i0=int(clip(floor(start),0,Ndata))
+            i1=int(clip(ceil(stop)+1,0,Ndata))
+        else:
+            i0=int(searchsorted(datax,start,side="left"))
+            i1=int(searchsorted(datax,stop,side="right"))
+        Nvisible=i1-i0
+        if Nvisible<=0:
+            return(empty(0),empty(0))
+        if Nvisible<=2*Nmax:
+            if datax is None:
+                xd=arange(i0,i1,dtype=float64)
+            else:
+                xd=asarray(datax[i0:i1],dtype=float64)
+            return(xd,asarray(datay[i0:i1],dtype=float64))
+        Nbucket=int(ceil(Nvisible/Nmax)) # samples per bucket, at most Nmax buckets
+        Nfull=Nvisible//Nbucket # number of complete buckets
+        iend=i0+Nfull*Nbucket
+        buckets=datay[i0:iend].reshape(Nfull,Nbucket)
+        ymin=buckets.min(axis=1).astype(float64)
+        ymax=buckets.max(axis=1).astype(float64)
+        if datax is None:
+            xb=arange(i0,iend,Nbucket,dtype=float64)+(Nbucket-1)/2
+        else:
+            xb=asarray(datax[i0+Nbucket//2:iend:Nbucket],dtype=float64)
+        if iend<i1: # last samples in a shorter bucket
+            rest=datay[iend:i1]
+            ymin=append(ymin,float64(rest.min()))
+            ymax=append(ymax,float64(rest.max()))
+            xb=append(xb,(iend+i1-1)/2 if datax is None else float64(datax[(iend+i1-1)//2]))
+        xd=repeat(xb,2)
+        yd=column_stack((ymin,ymax)).ravel()
+        return(xd,yd)
+
+
+# value with get() and set(), used instead of Tkinter variables when there is no Tkinter window
+class Setting:
+    def __init__(self,value):
+        self.value=value
+    
+    def get(self):
+        return(self.value)
+    
+    def set(self,value):
+        self.value=value
+
+
+# Class for the application derived from tkinter.Tk
+class Plotter(Plotcore,tkinter.Tk): 
+    def __init__(self): 
+        tkinter.Tk.__init__(self) # call init from parent class
+        self.title("Plotter using Matplotlib in Tkinter")
+        self.resizable(width=True,height=True)
+        self.geometry("1100x750") # afmetingen voor start
+        self.configure(bg='#A0A0A0')
+        
+        # instance variables
+        Plotcore.__init__(self) # variables for evaluation and plotting
+        
+        self.invphi = (sqrt(5) - 1) / 2  # 1 / phi # constant for numeric method
+        
+        self.initexpr = "x" # expression to be plotted, a simple "x" at startup
+        self.definitionstxt = "" # text of the user defined functions, one per line
+        self.errorestimate = tkinter.BooleanVar() # show error estimate from higher precision spot check
+        self.errorestimate.set(False)
+        self.precisiontext = None # Text object on Figure showing the error estimate
+        self.evaluatedinputs = None # inputs used for the last succesful evaluation in update()
+        self.numericcache = {} # results of the numerical methods, oldest entry first
+        self.numericcachesize = 64 # max. number of results kept in self.numericcache
+        self.Ncubature = 2**21 # max. number of nodes evaluated at once for a double integral
+        self.dragstart = None # mouse position when rotating the fast 3d line view
+        self.Ndrag = 20000 # max. number of points drawn while rotating
+        self.exportthread = None # thread rendering image files in the background
+        self.exportdone = 0 # number of image files written by the export thread
+        self.exporterrors = [] # error messages from the export thread
+        self.exportjoblist = [] # (path, bbox) of the files written by the export thread
+        self.exportwindow = None # dialog box for export, showing the progress
+        self.streambuffer = None # Streambuffer of the live stream, None when not streaming
+        self.Nstream = 100000 # number of samples kept in the ring buffer of the live stream
+        self.streaminterval = 40 # time between frames of the live stream in ms
+        self.streamline = None # Line2D showing the live stream, drawn using blitting
+        self.streambackground = None # plot without the live stream, restored for every frame
+        self.streamlimits = None # (left, right, bottom, top) of the axes of the live stream
+        self.streamNtotal = 0 # number of samples received at the last frame
+        self.Nfit = 100000 # max. number of samples used for a curve fit
+        self.fitx = None # x and y values used for the last curve fit
+        self.fity = None
+        self.fitresiduals = None # y minus fitted values of the last curve fit
+        
+        
+        # set behaviour at resizing for the various grid rows and column
+        self.rowconfigure(0, weight = 3)
+        self.rowconfigure(1, weight = 0)
+        self.rowconfigure(2, weight = 0)
+        self.rowconfigure(3, weight = 0)
+        self.rowconfigure(4, weight = 0)
+        self.columnconfigure(0, weight = 1)
+        
+        # define Figure object from Matplotlib and set background color
+        self.fig = Figure()
+        self.fig.patch.set_facecolor('#ffffff')
+        
+        # generate a plot from the Fifure object - Matplotlib
+        self.ax = self.fig.add_subplot()  
+        
+        # generate a canvas object from Matplotlib with the Figure object 
+        # from matplotlib and the Tk object from Tkinter as argument
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)  # A tk.DrawingArea.
+        self.canvas.get_tk_widget().configure(background='#ffffff')
+        self.canvas.draw()        
+        
+        # mouse events for rotating the fast 3d line view
+        self.canvas.mpl_connect('button_press_event',self.fast3dpress)
+        self.canvas.mpl_connect('motion_notify_event',self.fast3dmotion)
+        self.canvas.mpl_connect('button_release_event',self.fast3drelease)
+        
+        # new background for blitting the live stream after every complete redraw
+        self.canvas.mpl_connect('draw_event',self.streamdraw)
+        
+        # define menus - Tkinter
+        self.menubar=tkinter.Menu(self,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
+        self.menufile=tkinter.Menu(self.menubar,tearoff=0,background="#A0A0A0", fg="#000000",font=("calibri",11,"bold"))
+        self.menufile.add_command(label="Save as CSV",command=self.saveascsv)
+        self.menufile.add_command(label="Save as image",command=self.saveasimg)
+        self.menufile.add_command(label="Export images",command=self.exportimages)
+        self.menufile.add_separator()
+        self.menufile.add_command(label="Import data",command=self.importdata)
+        self.menufile.add_command(label="Clear imported data",command=self.cleardata)
+        self.menufile.add_command(label="Start live stream",command=self.startstream)
+        self.menufile.add_command(label="Stop live stream",command=self.stopstream)
+        self.menufile.add_separator()
+        self.menufile.add_command(label="Exit",command=self.destroy)
+        self.menubar.add_cascade(label="File",menu=self.menufile)
+        self.menutools=tkinter.Menu(self.menubar,tearoff=0,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
+        self.menutools.add_command(label="Find root",command=self.findroot)
+        self.menutools.add_command(label="Find maximum",command=self.findmaximum)
+        self.menutools.add_command(label="Find minimum",command=self.findminimum)
+        self.menutools.add_command(label="Integrate",command=self.findintegralscipyquad)
+        self.menutools.add_command(label="Double integral f(x,y)",command=self.finddoubleintegral)
+        self.menutools.add_command(label="Spectrum",command=self.spectrum)        
+        self.menutools.add_command(label="Curve fit",command=self.curvefit)
+        self.menutools.add_command(label="Chebyshev approximant",command=self.findapproximant)
+        self.menubar.add_cascade(label="Tools",menu=self.menutools)
+        self.menusettings=tkinter.Menu(self.menubar,tearoff=0,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
+        self.menusettings.add_command(label="Number of points",command=self.setnumberofpoints)
+        self.menusettings.add_command(label="Complex resolution",command=self.setcomplexresolution)
+        self.menusettings.add_command(label="Function definitions",command=self.editdefinitions)
+        self.submenuprecision=tkinter.Menu(self.menusettings,tearoff=0,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
+        self.submenuprecision.add_radiobutton(label="float32 (fast, less memory)", value="float32", variable=self.precision, command=self.update)
+        self.submenuprecision.add_radiobutton(label="float64 (default)", value="float64", variable=self.precision, command=self.update)
+        self.submenuprecision.add_radiobutton(label="longdouble (accurate)", value="longdouble", variable=self.precision, command=self.update)
+        self.submenuprecision.add_separator()
+        self.submenuprecision.add_checkbutton(label="Show error estimate", onvalue=1, offvalue=0, variable=self.errorestimate, command=self.update)
+        self.menusettings.add_cascade(label="Precision", menu=self.submenuprecision)
+        self.menusettings.add_separator()
+        self.submenucolors=tkinter.Menu(self.menusettings,tearoff=0,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
+        self.submenucolors.add_command(label="Line color",command=self.setlinecolor)
+        self.submenucolors.add_command(label="Label color",command=self.setlabelcolor)
+        self.submenucolors.add_command(label="Grid color",command=self.setgridcolor)
+        self.submenucolors.add_command(label="Axis color",command=self.setaxiscolor)
+        self.submenucolors.add_command(label="Plot background color",command=self.setplotbackgroundcolor)
+        self.submenucolors.add_command(label="Background color",command=self.setbackgroundcolor)
+        self.submenucolors.add_command(label="Imported data color",command=self.setdatacolor)
+        self.menusettings.add_cascade(label="Set colors", menu=self.submenucolors)
+        self.menusettings.add_command(label="Line thickness", command=self.setlinethickness)
+        self.menusettings.add_command(label="Font size",command=self.setfontsize)
+        self.menusettings.add_separator()
+        self.menusettings.add_checkbutton(label="plot f(x) using Chebyshev approximant", onvalue=1, offvalue=0, variable=self.proxymode, command=self.update)
+        self.menusettings.add_checkbutton(label="logarithmic x axis", onvalue=1, offvalue=0, variable=self.logx, command=self.update)
+        self.menusettings.add_checkbutton(label="logarithmic y axis", onvalue=1, offvalue=0, variable=self.logy, command=self.update)
+        self.menusettings.add_checkbutton(label="x y plot", onvalue=1, offvalue=0, variable=self.xymode, command=self.update)
+        self.menusettings.add_checkbutton(label="x y density view", onvalue=1, offvalue=0, variable=self.densitymode, command=self.update)
+        self.menusettings.add_checkbutton(label="logarithmic density scale", onvalue=1, offvalue=0, variable=self.densitylog, command=self.update)
+        self.menusettings.add_checkbutton(label="polar plot (experimental)", onvalue=1, offvalue=0, variable=self.polarmode, command=self.update)
+        self.menusettings.add_checkbutton(label="3D line plot (experimental)", onvalue=1, offvalue=0, variable=self.line3dmode, command=self.update)
+        self.menusettings.add_checkbutton(label="fast 3D line view", onvalue=1, offvalue=0, variable=self.fast3dmode, command=self.update)
+        self.menusettings.add_checkbutton(label="3D surface plot (experimental)", onvalue=1, offvalue=0, variable=self.surface3dmode, command=self.update)
+        self.menusettings.add_checkbutton(label="complex domain coloring f(z)", onvalue=1, offvalue=0, variable=self.complexmode, command=self.update)
+        self.menusettings.add_checkbutton(label="differential equation y'=f(x,y)", onvalue=1, offvalue=0, variable=self.odemode, command=self.update)
+        self.menusettings.add_checkbutton(label="adaptive step size for y'=f(x,y)", onvalue=1, offvalue=0, variable=self.odeadaptive, command=self.update)
+        self.menusettings.add_command(label="Initial values for y'=f(x,y)",command=self.setodeinitialvalues)
+        self.menubar.add_cascade(label="Settings",menu=self.menusettings)
+        self.menuexamples=tkinter.Menu(self.menubar,tearoff=0,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
+        self.menuexamples.add_command(label="Sinc",command=lambda: self.plotfunction("sinc(x)","-6","6",False,False,False,False))
+        self.menuexamples.add_command(label="Wavelet",command=lambda: self.plotfunction("exp(-x**2)*sin(pi*x*4)","-e","e",False,False,False,False))
+        self.menuexamples.add_command(label="Oscillation",command=lambda: self.plotfunction("(x>0)*exp(-x/3)*sin(2*pi*x)","-1","10",False,False,False,False))
+        self.menuexamples.add_command(label="Polynomial",command=lambda: self.plotfunction("x**3-15*x+3","-5","5",False,False,False,False))
+        self.menuexamples.add_command(label="Beat frequency",command=lambda: self.plotfunction("sin(x)+sin(1.1*x)","-pi*20","pi*20",False,False,False,False))
+        self.menuexamples.add_command(label="Catenary",command=lambda: self.plotfunction("2*cosh(x/2)","-2","2",False,False,False,False))
+        self.menuexamples.add_command(label="Phase control",command=lambda: self.plotfunction("((x%1)>.3)*sin(pi*x)","-2","2",False,False,False,False))
+        self.menuexamples.add_command(label="Low-pass filter (log-log)",command=lambda: self.plotfunction("1/sqrt(1+(x/1E3)**2)","1","1E6",False,False,False,False,logx=True,logy=True))
+        self.menuexamples.add_separator()
+        self.menuexamples.add_command(label="Lissajous",command=lambda: self.plotfunction("sin(3*x),cos(5*x)","-pi","pi",True,False,False,False))
+        self.menuexamples.add_separator()
+        self.menuexamples.add_command(label="Polar rose",command=lambda: self.plotfunction("2*sin(4*x)","0","pi*2",False,True,False,False))
+        self.menuexamples.add_separator()
+        self.menuexamples.add_command(label="3D lissajous",command=lambda: self.plotfunction("cos(x),-sin(x/3),sin(x)","-pi*3","pi*3",False,False,True,False))
+        self.menuexamples.add_command(label="3D spiral",command=lambda: self.plotfunction("x*cos(x),x*sin(x),sqrt(x)","0","pi*12",False,False,True,False))
+        self.menuexamples.add_command(label="3D wave",command=lambda: self.plotfunction("sin(6*x)*exp(-x**2/20),cos(6*x)*exp(-x**2/20),x","-10","10",False,False,True,False))
+        self.menuexamples.add_command(label="3D sphere",command=lambda: self.plotfunction("sqrt(100-x**2)*sin(6*x),sqrt(100-x**2)*cos(6*x),x","-10","10",False,False,True,False))
+        self.menuexamples.add_separator()
+        self.menuexamples.add_command(label="3D surface sinc",command=lambda: self.plotfunction("sinc(sqrt(x**2+y**2))","-3","3",False,False,False,True))
+        self.menuexamples.add_command(label="3D surface dome",command=lambda: self.plotfunction("-2*cosh(sqrt(x**2+y**2)/2)","-1","1",False,False,False,True))
+        self.menuexamples.add_command(label="3D surface wave",command=lambda: self.plotfunction("sin(x)*cos(y)","-pi","pi",False,False,False,True))
+        self.menuexamples.add_separator()
+        self.menuexamples.add_command(label="Complex roots of unity",command=lambda: self.plotfunction("z**3-1","-2","2",False,False,False,False,True))
+        self.menuexamples.add_command(label="Complex poles",command=lambda: self.plotfunction("1/(z**2+1)","-2","2",False,False,False,False,True))
+        self.menuexamples.add_command(label="Complex sine",command=lambda: self.plotfunction("sin(z)","-pi","pi",False,False,False,False,True))
+        self.menuexamples.add_separator()
+        self.menuexamples.add_command(label="ODE logistic growth",command=lambda: self.plotfunction("y*(1-y)","0","6",False,False,False,False,ode=True))
+        self.menuexamples.add_command(label="ODE forced decay",command=lambda: self.plotfunction("sin(2*x)-y","0","10",False,False,False,False,ode=True))
+        self.menuexamples.add_command(label="ODE Riccati",command=lambda: self.plotfunction("x-y**2","-2","4",False,False,False,False,ode=True))
+        self.menubar.add_cascade(label="Examples",menu=self.menuexamples)
+        self.menuranges=tkinter.Menu(self.menubar,tearoff=0,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
+        self.menuranges.add_command(label="-1.0 .. 1.0",command=lambda: self.setrange("-1.0","1.0"))
+        self.menuranges.add_command(label="0 .. 1.0",command=lambda: self.setrange("0","1.0"))
+        self.menuranges.add_command(label="-10.0 .. 10.0",command=lambda: self.setrange("-10.0","10.0"))
+        self.menuranges.add_command(label="0 .. 10.0",command=lambda: self.setrange("0","10.0"))
+        self.menuranges.add_command(label="-pi .. pi",command=lambda: self.setrange("-pi","pi"))
+        self.menuranges.add_command(label="-2.*pi .. 2*pi",command=lambda: self.setrange("-2.0*pi","2.0*pi"))
+        self.menubar.add_cascade(label="X ranges",menu=self.menuranges)
+        self.menucolorpreset=tkinter.Menu(self.menubar,tearoff=0,background="#A0A0A0", fg="#000000",font=("FreeSans",11,"bold"))
+        for name,colors in colorpresets.items():
+            self.menucolorpreset.add_command(label=name,command=lambda colors=colors: self.presetcolor(**colors))
+        self.menubar.add_cascade(label="Color presets",menu=self.menucolorpreset)
+        self.config(menu=self.menubar)        
+        
+        
+        # ttk styles 
+        self.stylebutton=ttk.Style()
+        self.stylebutton.configure("TButton",font=("FreeSans",11,"bold"),background="#A0A0A0",foreground="#000000")
+        self.stylelabel=ttk.Style()
+        self.stylelabel.configure("TLabel",font=("FreeSans",11,"bold"),background="#A0A0A0",foreground="#000000")
+        self.styleframe=ttk.Style()
+        self.styleframe.configure("TFrame",font=("FreeSans",11,"bold"),background="#A0A0A0",foreground="#000000")
+               
+        # Frames - ttk Tkinter
+        self.framecontrols=ttk.Frame(master=self)
+        self.framecontrols.rowconfigure(0, weight = 1)
+        self.framecontrols.columnconfigure(0, weight = 1)
+        self.framecontrols.columnconfigure(1, weight = 1)
+        self.framecontrols.columnconfigure(2, weight = 1)
+        self.framecontrols.columnconfigure(3, weight = 1)
+        self.framecontrols.columnconfigure(4, weight = 1)
+        self.framecontrols.columnconfigure(5, weight = 1)
+        self.frameentries=ttk.Frame(master=self)
+        self.frameentries.rowconfigure(0, weight = 1)
+        self.frameentries.columnconfigure(0, weight = 0)
+        self.frameentries.columnconfigure(1, weight = 0)
+        self.frameentries.columnconfigure(2, weight = 3)
+        self.framefunbuttons=ttk.Frame(master=self)
+        self.framefunbuttons.rowconfigure(0, weight = 1)
+        
+        # entries - ttk
+        self.entryxstart=tkinter.Entry(self.frameentries, width=14,font=("FreeMono",13,"bold"),insertwidth=2)
+        self.entryxstart.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.entryxstop=tkinter.Entry(self.frameentries, width=14,font=("FreeMono",13,"bold"),insertwidth=2)
+        self.entryxstop.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.entryexpr =tkinter.Entry(self.frameentries, width=45,font=("FreeMono",13,"bold"),insertwidth=2)
+        self.entryexpr.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.entryexpr.insert(tkinter.END, self.initexpr)
         
-        # self.y is tuple of 3 numpy ndarray
-        xx,yy,zz,*other = self.y  
+        # labels - ttk
+        self.label_xstart=ttk.Label(master=self.frameentries,text="Start")
+        self.label_xstop=ttk.Label(master=self.frameentries,text="Stop")
+        self.label_expr=ttk.Label(master=self.frameentries,text="Expression f(x) = ")
         
-        if type(xx) is not ndarray:
-            waarde=xx
-            xx=empty(self.N)
-            xx.fill(waarde)
-        if type(yy) is not ndarray:
-            waarde=yy
-            yy=empty(self.N)
-            yy.fill(waarde)      
-        if type(zz) is not ndarray:
-            waarde=zz
-            zz=empty(self.N)
-            zz.fill(waarde)
-
-        # plot the line using 3 ndarrays
-        self.ax.plot(xx, yy, zz, color=self.linecolor, linewidth=self.linethickness)
+        # buttons - ttk
+        self.button_quit = ttk.Button(master=self.framecontrols, width=13, text="Quit", command=self.destroy)
+        self.button_plot = ttk.Button(master=self.framecontrols, width=13, text="Plot", command=self.update)
+        self.button_zoomout=ttk.Button(master=self.framecontrols, width=13, text="Zoom out", command=self.zoomout)
+        self.button_zoomin=ttk.Button(master=self.framecontrols, width=13, text="Zoom in", command=self.zoomin)
+        self.button_panleft=ttk.Button(master=self.framecontrols, width=13, text="<<", command=self.panleft)
+        self.button_panright=ttk.Button(master=self.framecontrols, width=13, text=">>", command=self.panright)            
         
-        # set colors and text
-        title=self.txt
-        self.ax.xaxis.set_pane_color(self.plotbackgroundcolor)
-        self.ax.yaxis.set_pane_color(self.plotbackgroundcolor)
-        self.ax.zaxis.set_pane_color(self.plotbackgroundcolor)
-        self.ax.xaxis._axinfo['grid']['color'] = self.gridcolor
-        self.ax.yaxis._axinfo['grid']['color'] = self.gridcolor
-        self.ax.zaxis._axinfo['grid']['color'] = self.gridcolor
-        self.ax.xaxis._axinfo['axisline']['color'] = self.gridcolor
-        self.ax.yaxis._axinfo['axisline']['color'] = self.gridcolor
-        self.ax.zaxis._axinfo['axisline']['color'] = self.gridcolor
-        self.ax.set_title(title,fontweight="bold", size=self.fontsize, color=self.linecolor) # Title
-        self.ax.set_facecolor(self.backgroundcolor)
-        self.fig.set_facecolor(self.backgroundcolor)
-        self.ax.xaxis.label.set_color(self.labelcolor)
-        self.ax.yaxis.label.set_color(self.labelcolor)
-        self.ax.zaxis.label.set_color(self.labelcolor)
-        self.ax.tick_params(axis='x', colors=self.axiscolor)
-        self.ax.tick_params(axis='y', colors=self.axiscolor)
-        self.ax.tick_params(axis='z', colors=self.axiscolor)
-        self.ax.xaxis.set_tick_params(labelsize=self.fontsize)
-        self.ax.yaxis.set_tick_params(labelsize=self.fontsize)
-        self.ax.zaxis.set_tick_params(labelsize=self.fontsize)
         
-        # canvas en toolbar updated
-        self.canvas.draw()
-
+        # align widgets using grid() - ttk
+        # canvas
+        self.canvas.get_tk_widget().grid(row = 0, column = 0, sticky="WENS")
+        # frame for function buttons
+        self.framefunbuttons.grid(row=1,column=0, sticky="WENS")
+        # frame for entries and labels
+        self.frameentries.grid(row=2,column=0, sticky="WENS")
+        self.label_xstart.grid(row=1,column=0, padx=10, sticky="W")
+        self.label_xstop.grid(row=1,column=1, padx=10, sticky="W")
+        self.label_expr.grid(row=1,column=2, padx=10, sticky="W")
+        self.entryxstart.grid(row=2, column=0, sticky="W")
+        self.entryxstop.grid(row=2, column=1, sticky="W")
+        self.entryexpr.grid(row = 2, column = 2, sticky="WENS")
+        # frame for control buttons
+        self.framecontrols.grid(row = 3, column = 0, sticky="WENS")
+        self.button_quit.grid(row = 0, column = 0, sticky="WENS")
+        self.button_panleft.grid(row = 0, column = 1, sticky="WENS")
+        self.button_zoomout.grid(row = 0, column = 2, sticky="WENS")
+        self.button_zoomin.grid(row = 0, column = 3, sticky="WENS")
+        self.button_panright.grid(row = 0, column = 4, sticky="WENS")
+        self.button_plot.grid(row = 0, column = 5, sticky="WENS")
         
-    # POLAR plot 
-    def plotpolar(self):
+        # define function buttons, align using grid() and set columnconfigure
+        mathfunctions=("sin","cos","tan","sinc","sinh","cosh","tanh","exp","log","log10","sign","sqrt")
+        for n,fun in enumerate(mathfunctions):
+            b=ttk.Button(master=self.framefunbuttons, width=6, text=fun,
+                    command=lambda fun=fun: self.insertfunction(fun) )
+            b.grid(row=0, column=n, sticky="WENS")
+            self.framefunbuttons.columnconfigure(n, weight = 1)
         
-        if type(self.y) is not ndarray:
-            waarde=self.y
-            self.y=empty(self.N)
-            self.y.fill(waarde)
         
-        # adapt data because matplotlib does not plot negative r values
-        # on the negative siden of the origin
-        # add pi radials for the points for which r < 0
-        # then replace r with it's absolute value
-        def modifyforpolar(r,theta): # this function adds pi to theta if r<0, then returns theta
-            if r<0:
-                theta+=pi
-            return(theta)
+        # keyboard events binding
+        self.bind('<KeyRelease>',self.key_released )
         
-        # apply modifyforpolar on all values in self.t toepassen  
-        thetamod=list(map(modifyforpolar,self.y,self.t))
+        # fill in values for start and stop
+        self.updatestartstoptxtbox()
         
-        # using map() take absolute value of rfor all points
-        rmod=list(map(abs,self.y))
+        # set colors        
+        self.presetcolor()   
+    
+    
+    # add function to expression when a function button is clicked
+    def insertfunction(self,fun):
+        self.entryexpr.insert( tkinter.INSERT, fun + "(" )
+        self.entryexpr.insert( tkinter.END, ")" )
+           
         
-        # matplotlib plot deleted 
-        self.fig.delaxes(self.ax)
+    # zoom out plot, update values for tstart and tstop
+    # remake plot with the new values
+    def zoomout(self):        
+        self.moveinterval(-1,1)
         
-        # create new polar plot on Figure object                  
-        self.ax = self.fig.add_subplot(projection='polar') 
         
-        # generate plot via matplotlib plot() 
-        # plot rmod in function of thetamod 
-        self.line = self.ax.plot(thetamod, rmod, color=self.linecolor, linewidth=self.linethickness)
+    # zoom in plot, update values for tstart and tstop
+    # remake plot with the new values
+    def zoomin(self):
+        self.moveinterval(1/3,-1/3)
+    
+    # pan left plot, update values for tstart and tstop
+    # remake plot with the new values
+    def panleft(self):
+        self.moveinterval(-1/4,-1/4)
+
+    # pan right plot, update values for tstart and tstop
+    # remake plot with the new values
+    def panright(self):
+        self.moveinterval(1/4,1/4)
+    
+    # move tstart and tstop by left and right times the width of the interval
+    # on a logarithmic x axis the width is taken in log(x), so the steps are multiplicative
+    def moveinterval(self,left,right):
+        if self.logxactive() and (self.tstart>0) and (self.tstop>0):
+            logstart,logstop=log(self.tstart),log(self.tstop)
+            self.tspan=logstop-logstart
+            self.tstart=float(exp(logstart+left*self.tspan))
+            self.tstop=float(exp(logstop+right*self.tspan))
+        else:
+            self.tspan=self.tstop-self.tstart
+            self.tstart=self.tstart+left*self.tspan
+            self.tstop=self.tstop+right*self.tspan
+        self.updatestartstoptxtbox()
+        self.update()
         
-        # set colors and text
-        title="r(x)="+self.txt
-        self.ax.grid(color = self.gridcolor, linewidth = 0.5)
-        self.ax.set_title(title,fontweight="bold", size=self.fontsize, color=self.linecolor) # Title
-        self.ax.set_facecolor(self.plotbackgroundcolor)
-        self.fig.set_facecolor(self.backgroundcolor)
-        self.ax.xaxis.label.set_color(self.labelcolor)
-        self.ax.yaxis.label.set_color(self.labelcolor)
-        self.ax.tick_params(axis='x', colors=self.axiscolor)
-        self.ax.tick_params(axis='y', colors=self.axiscolor)
-        self.ax.xaxis.set_tick_params(labelsize=self.fontsize)
-        self.ax.yaxis.set_tick_params(labelsize=self.fontsize)
+           
+    # update values of tstart en tstop entry boxes
+    def updatestartstoptxtbox(self):
+        self.entryxstart.delete(0, 'end')
+        self.entryxstart.insert(tkinter.END,self.roundvaluestr(self.tstart,8))
+        self.entryxstop.delete(0, 'end')
+        self.entryxstop.insert(tkinter.END,self.roundvaluestr(self.tstop,8))
         
-        # canvas en toolbar updated
-        self.canvas.draw()
+
+    # set expression for the initial values of y'=f(x,y) using simple dialog
+    def setodeinitialvalues(self):
+        answer=simpledialog.askstring("Initial values","Enter expression for the initial values y(xstart), for example linspace(-2,2,21)",initialvalue=self.odey0txt)
+        if not(answer is None):
+            try:
+                y0=asarray(eval(answer),dtype=float64).ravel()
+            except (SyntaxError,NameError,TypeError,ValueError) as inst:
+                tkinter.messagebox.showerror("Initial values not correct",str(inst))
+                return
+            if len(y0)==0:
+                tkinter.messagebox.showerror("Initial values not correct","No initial values given")
+                return
+            self.odey0txt=answer
+            self.update()
         
+    # start rotating the fast 3d line view with left mouse button
+    def fast3dpress(self,event):
+        if (self.fast3dline is not None) and (self.fast3dline.axes is self.ax) \
+            and (event.inaxes is self.ax) and (event.button==1):
+            self.dragstart=(event.x,event.y)
+    
+    # rotate fast 3d line view using decimated points
+    def fast3dmotion(self,event):
+        if self.dragstart is None:
+            return
+        dx=event.x-self.dragstart[0]
+        dy=event.y-self.dragstart[1]
+        self.dragstart=(event.x,event.y)
+        self.azimuth-=dx*0.4
+        self.elevation=float(clip(self.elevation-dy*0.4,-90,90))
+        self.drawfast3d(self.Ndrag)
+    
+    # stop rotating, draw fast 3d line view in full resolution
+    def fast3drelease(self,event):
+        if self.dragstart is None:
+            return
+        self.dragstart=None
+        self.drawfast3d()
         
         
-    # generate numpy array self.t represnting x waarden for function
-    # calculate values for new plot in numpy array self.y
+    # get expression and interval out of the entry boxes
+    # calculate values for new plot using self.evaluate()
     # generate a new plot using self.plotfx() or self.plotxy() or self.plotpolar()
     def update(self):
         
@@ -577,64 +1241,38 @@ class Plotter(tkinter.Tk):
             tkinter.messagebox.showerror("Error","Interval not correct")
             self.updatestartstoptxtbox() # change entry boxec to previous values and continue
         
-        if "y" in self.txt:
-            self.surface3dmode.set(True)        
-        
-        if self.surface3dmode.get():
-            Number=int(sqrt(self.N))
-            self.t = linspace( self.tstart , self.tstop , Number )
-            self.v,self.w = meshgrid(self.t, self.t)
-
-        else:
-            # numpy array self.t generated using numpy.linspace()
-            self.t = linspace( self.tstart , self.tstop , self.N )
+        if self.logxactive() and ((self.tstart<=0) or (self.tstop<=0)):
+            tkinter.messagebox.showerror("Error","Interval should be positive for logarithmic x axis")
+            return(False)
         
-        # numpy array self.y generated by applying evalexpression() on every 
-        # value of numpy array t using map()
         # error handling for errors which make further calculatons useless
-        if self.surface3dmode.get():
-            try:        
-                self.y = self.evalexpression( self.v , self.w )
-            except (SyntaxError,NameError,TypeError) as inst:     
-                tkinter.messagebox.showerror("Function not correct",inst.args[0])
-                return(False) # False returned when error    
-        else:
-            try:        
-                self.y = self.evalexpression( self.t )
-            except (SyntaxError,NameError,TypeError) as inst:     
-                tkinter.messagebox.showerror("Function not correct",inst.args[0])
-                return(False) # False returned when error 
-        
-        # when 1 "," is present in the function self.txt it contains 2 functions for xy plot    
-        # when 2 ","are present it is an 3D line plot
-        match self.txt.count(","):
-            case 0:
-                self.xymode.set(False)
-                self.line3dmode.set(False)
-            case 1:
-                self.xymode.set(True)
-                self.line3dmode.set(False)
-                self.surface3dmode.set(False)
-            case 2:
-                self.xymode.set(False)
-                self.line3dmode.set(True)
-                self.surface3dmode.set(False)
+        try:        
+            self.evaluate()
+        except (SyntaxError,NameError,TypeError) as inst:     
+            tkinter.messagebox.showerror("Function not correct",inst.args[0])
+            return(False) # False returned when error    
+        self.evaluatedinputs=self.evaluationinputs()
+        
+        # error estimate shown as text on the Figure object, independent of the type of plot
+        if self.precisiontext is not None:
+            self.precisiontext.remove()
+            self.precisiontext=None
+        if self.errorestimate.get() and not (self.complexmode.get() or self.odemode.get()):
+            try:
+                error=self.precisionerror()
+            except (SyntaxError,NameError,TypeError,ValueError):
+                error=None
+            if error is None:
+                info=self.precision.get()+", no higher precision available for error estimate"
+            else:
+                info=self.precision.get()+", estimated relative error "+self.roundvaluestr(error,2)
+            self.precisiontext=self.fig.text(0.01, 0.01, info, color=self.labelcolor, fontsize=self.fontsize*0.7)
                 
                     
-        # plotten, type of plot depends on tkinter booleans self.polarmode and self.xymode
-        if self.surface3dmode.get():
-            self.plot3dsurface()
-        elif self.polarmode.get():
-            self.plotpolar()
-        elif self.xymode.get():
-            self.plotxy()
-        elif self.line3dmode.get():
-            self.plot3dline()
-        else:
-            self.plotfx()        
+        self.plotcurrent()
         
         return(True) # True returned when all is ok
-        
+    
     # doe a and b have same sign, True of False
     # funktion used by numerical method
     def signissame(self,a,b):
@@ -648,9 +1286,9 @@ class Plotter(tkinter.Tk):
             
     # find root of function using extra window of class self.findnumericwindow
     def findroot(self):
-        # self.update() returns False in case of error in fucntion 
+        # self.refresh() returns False in case of error in fucntion 
         # check if a toplevel window is not opened yet using self.get_toplevel_windows()
-        if self.update() and (len(self.get_toplevel_windows())==0): #update succesvol en nog geen ander Toplevel() venster open
+        if self.refresh() and (len(self.get_toplevel_windows())==0): #update succesvol en nog geen ander Toplevel() venster open
             tolerance=1E-13
             Nmaxinterations=5000
             self.findnumericwindow=Findnumericwindow("root") # custom dialoog box creeren
@@ -667,44 +1305,95 @@ class Plotter(tkinter.Tk):
             
     # finding root of function using extra window
     # values are usind to call optimize.root_scalar 
+    # result is looked up in self.numericcache when the same question was asked before
     def showroot(self):                    
         start=eval(self.findnumericwindow.startentry.get())
         stop=eval(self.findnumericwindow.stopentry.get())
-        fa=self.evalexpression(start)
-        fb=self.evalexpression(stop)
-        if self.signissame(fa,fb):
-            self.findnumericwindow.textbox.delete("1.0", "end")
-            self.findnumericwindow.textbox.insert(tkinter.END, "Root finding error\nFunction has same sign at left and right bounds")
-            return
         tolerance=eval(self.findnumericwindow.toleranceentry.get())
         Nmaxinterations=eval(self.findnumericwindow.maxNentry.get())
         if Nmaxinterations>(sys.getrecursionlimit()-50): # controle op max. aantal interaties
             Nmaxinterations=sys.getrecursionlimit()-50
+        key=("root",self.txt,self.precision.get(),start,stop,tolerance,Nmaxinterations)
+        output=self.cachedresult(key,lambda: self.calculateroot(start,stop,tolerance,Nmaxinterations))
+        self.findnumericwindow.textbox.delete("1.0", "end")
+        self.findnumericwindow.textbox.insert(tkinter.END, output)
+        
+    # calculate root using optimize.root_scalar, output is str for the textbox
+    def calculateroot(self,start,stop,tolerance,Nmaxinterations):
+        fa=self.evalscalar(start)
+        fb=self.evalscalar(stop)
+        if self.signissame(fa,fb):
+            return("Root finding error\nFunction has same sign at left and right bounds")
         
         # Scipy optimize.root_scalar functie used to find root
-        sol = root_scalar(self.evalexpression, bracket=[start, stop], \
+        sol = root_scalar(self.evalscalar, bracket=[start, stop], \
             method='brentq', maxiter=Nmaxinterations, xtol=tolerance)
         r, Ninterations=sol.root, sol.iterations    
         if sol.converged:
             rstr=f"{r:.12f}"
-            f=self.evalexpression(r)
+            f=self.evalscalar(r)
             fstr=f"{f:.12e}"
             output="Function f(x) = "+self.txt+"\nInterval "+str(start)+" to "+str(stop)
             output+="\nRoot "+rstr+"\nCheck "+fstr
             output+="\nNumber of iterations "+str(Ninterations)
-            self.findnumericwindow.textbox.delete("1.0", "end")
-            self.findnumericwindow.textbox.insert(tkinter.END, output)
+            output+="\nPrecision "+self.precision.get()
+            return(output)
         else: 
-            self.findnumericwindow.textbox.delete("1.0", "end")
-            self.findnumericwindow.textbox.insert(tkinter.END, str(sol))
+            return(str(sol))
+    
+    # return result of a numerical method from self.numericcache or calculate it using calculate()
+    # key contains method, expression, precision, interval, tolerance and max. iterations
+    # oldest results are removed when the cache is full
+    def cachedresult(self,key,calculate):
+        if key in self.numericcache:
+            result=self.numericcache.pop(key) # reinserted below as newest entry
+        else:
+            result=calculate()
+            if len(self.numericcache)>=self.numericcachesize:
+                del self.numericcache[next(iter(self.numericcache))]
+        self.numericcache[key]=result
+        return(result)
+    
+    # inputs which determine the values of self.t and self.y
+    def evaluationinputs(self):
+        return((self.entryexpr.get(),self.entryxstart.get(),self.entryxstop.get(),self.N,self.Ncomplex,self.precision.get(), \
+            self.xymode.get(),self.polarmode.get(),self.line3dmode.get(),self.surface3dmode.get(),self.complexmode.get(), \
+            self.odemode.get(),self.odeadaptive.get(),self.odey0txt))
+    
+    # make sure self.t and self.y belong to the current inputs, used by the numerical methods
+    # only calls self.update() when something changed since the last evaluation
+    def refresh(self):
+        if self.evaluatedinputs==self.evaluationinputs():
+            return(True)
+        return(self.update())
+    
+    # interval around the largest (or smallest) value in the evaluated samples self.y
+    # used as starting interval for the golden section search
+    # the complete interval tstart..tstop is returned when samples can not be used
+    def samplebracket(self,largest):
+        if (type(self.y) is not ndarray) or (self.y.shape!=self.t.shape):
+            return(self.tstart,self.tstop)
+        try:
+            i=nanargmax(self.y) if largest else nanargmin(self.y)
+        except ValueError: # only nan values
+            return(self.tstart,self.tstop)
+        left=self.t[clip(i-1,0,len(self.t)-1)]
+        right=self.t[clip(i+1,0,len(self.t)-1)]
+        return(float(left),float(right))
       
                 
     def setnumberofpoints(self):
-        answer=simpledialog.askinteger("Number of points","Enter number of points to calculate for graph (100 .. 10000)",minvalue=100, maxvalue=10000,initialvalue=self.N)
+        answer=simpledialog.askinteger("Number of points","Enter number of points to calculate for graph (100 .. 10000000)",minvalue=100, maxvalue=10000000,initialvalue=self.N)
         if not(answer is None):
             self.N=answer
             self.update()
 
+    def setcomplexresolution(self):
+        answer=simpledialog.askinteger("Complex resolution","Enter number of pixels per side of the domain coloring image (10 .. 4000)",minvalue=10, maxvalue=4000,initialvalue=self.Ncomplex)
+        if not(answer is None):
+            self.Ncomplex=answer
+            self.update()
+
     def setlinecolor(self):
         answer=colorchooser.askcolor(self.linecolor)
         if not(answer[1] is None):
@@ -741,6 +1430,12 @@ class Plotter(tkinter.Tk):
         if not(answer[1] is None):
             self.backgroundcolor=answer[1]
             self.update()    
+            
+    def setdatacolor(self):
+        answer=colorchooser.askcolor(self.datacolor)
+        if not(answer[1] is None):
+            self.datacolor=answer[1]
+            self.update()
               
             
     def setlinethickness(self):
@@ -753,23 +1448,26 @@ class Plotter(tkinter.Tk):
         answer=simpledialog.askinteger("Font size","Enter new font size",minvalue=6, maxvalue=50,initialvalue=self.fontsize)
         if not(answer is None):
             self.fontsize=answer
-            self.update()
-    
-    # set presets for colors 
-    def presetcolor(self,linecolor="#FFFFFF",axiscolor="#B0B0B0",labelcolor="#B0B0B0", \
-        gridcolor="#B0B0B0",plotbackgroundcolor="#303030",backgroundcolor="#303030", colormap=cm.Greys_r):
-        self.linecolor = linecolor
-        self.axiscolor = axiscolor
-        self.labelcolor = labelcolor
-        self.gridcolor = gridcolor
-        self.plotbackgroundcolor = plotbackgroundcolor
-        self.backgroundcolor = backgroundcolor
-        self.colormap=colormap
+            self.update()
+    
+    # set presets for colors, arguments as for self.setcolors()
+    def presetcolor(self,**colors):
+        self.setcolors(**colors)
         self.update()
+    
+    # make a setting as Tkinter variable so it can be used in the menus
+    def newsetting(self,value):
+        if type(value) is bool:
+            return(tkinter.BooleanVar(value=value))
+        return(tkinter.StringVar(value=value))
         
             
     # plot an example function out of the menu examples
-    def plotfunction(self,txt,start,stop,xy,polar,line3d,surface3d):
+    def plotfunction(self,txt,start,stop,xy,polar,line3d,surface3d,complexplot=False,ode=False,logx=False,logy=False):
+        self.logx.set(logx)
+        self.logy.set(logy)
+        self.odemode.set(ode)
+        self.complexmode.set(complexplot)
         self.xymode.set(xy)
         self.polarmode.set(polar)
         self.line3dmode.set(line3d)
@@ -782,6 +1480,76 @@ class Plotter(tkinter.Tk):
         self.entryexpr.insert(tkinter.END, txt)
         self.update()
 
+    # edit user defined functions using extra window
+    def editdefinitions(self):
+        if len(self.get_toplevel_windows())==0: # no other Toplevel() window open yet
+            self.definitionswindow=Definitionswindow()
+            self.definitionswindow.textbox.insert(tkinter.END,self.definitionstxt)
+    
+    # compile text with user defined functions and plot again
+    # returns names of the functions which have to be calculated again
+    def applydefinitions(self,txt):
+        definitions,changed=self.compiledefinitions(txt,self.definitions)
+        self.definitions=definitions
+        self.definitionstxt=txt
+        self.numericcache={} # cached results can depend on the old definitions
+        self.update()
+        return(changed)
+    
+    # compile lines "name(arguments)=expression" into Definedfunction objects
+    # dependencies between the functions are checked for circular definitions
+    # a function keeps the cached result from olddefinitions when neither its definition
+    # nor any function it depends on changed, so only downstream functions are calculated again
+    # returns dict name: Definedfunction and list of changed names, raises ValueError or SyntaxError
+    def compiledefinitions(self,txt,olddefinitions):
+        definitions={}
+        for n,line in enumerate(txt.splitlines()):
+            if (line.strip()=="") or line.strip().startswith("#"):
+                continue
+            parts=re.fullmatch(r"\s*([A-Za-z_]\w*)\s*\(([^()]*)\)\s*=\s*(.+)",line)
+            if parts is None:
+                raise ValueError(f"Line {n+1} is not of the form name(x)=expression")
+            name,args,body=parts.groups()
+            args=tuple(arg.strip() for arg in args.split(",") if arg.strip()!="")
+            if name in definitions:
+                raise ValueError(f"Function {name} is defined twice")
+            if name in ("x","y","z"):
+                raise ValueError(f"Name {name} is used for the variables")
+            definitions[name]=Definedfunction(name,args,body.strip(),definitions)
+        
+        # dependencies are the names of other defined functions used in the expression
+        for function in definitions.values():
+            function.dependencies=(set(function.code.co_names)-set(function.args))&set(definitions)
+        
+        # depth first search gives the functions in order of dependency
+        order=[]
+        state={} # name: "busy" or "done"
+        def visit(name,path):
+            if state.get(name)=="done":
+                return
+            if state.get(name)=="busy":
+                raise ValueError("Circular definition "+" -> ".join(path+[name]))
+            state[name]="busy"
+            for dependency in sorted(definitions[name].dependencies):
+                visit(dependency,path+[name])
+            state[name]="done"
+            order.append(name)
+        for name in definitions:
+            visit(name,[])
+        
+        # keep cached results of functions which did not change
+        changed=[]
+        for name in order:
+            function=definitions[name]
+            old=olddefinitions.get(name)
+            if (old is None) or ((old.args,old.body)!=(function.args,function.body)) \
+                or any([dependency in changed for dependency in function.dependencies]):
+                changed.append(name)
+            else:
+                function.cachedargs=old.cachedargs
+                function.cachedresult=old.cachedresult
+        return(definitions,changed)
+
     # set preset x-as ranges out of menu X ranges    
     def setrange(self, start,stop):
         self.entryxstart.delete(0, 'end')
@@ -793,18 +1561,243 @@ class Plotter(tkinter.Tk):
     # values t en calculated values y seved in CSV file 
     # use filedialog.asksaveasfilename    
     def saveascsv(self):   
+        path=self.askcsvpath("plotter.csv")
+        if (path!='') and (path!=()): # als een geldig pad gegeven werd door dialoogbox
+            self.update()
+            # values are written with the digits of the selected precision
+            self.writecsv(path,["x","f(x)"],zip(self.t,self.y)) # zip() iterator gebruiken in combinatie met csv.writerows()
+    
+    # ask file name for CSV file using filedialog.asksaveasfilename
+    def askcsvpath(self,initialfile,parent=None):
         my_filetypes = [('csv files', '.csv') , ('all files', '.*')]
-        path = filedialog.asksaveasfilename(parent=self,initialfile="plotter.csv",
+        path = filedialog.asksaveasfilename(parent=self if parent is None else parent,initialfile=initialfile,
                                     initialdir=os.getcwd(),
                                     title="Please select a file name for saving:",
                                     filetypes=my_filetypes)
-        if (path!='') and (path!=()): # als een geldig pad gegeven werd door dialoogbox
-            self.update()
-            with open(path, 'w', encoding='UTF8') as f:
-                writer = csv.writer(f)
-                writer.writerow(["x","f(x)"])
-                writer.writerows(zip(self.t,self.y)) # zip() iterator gebruiken in combinatie met csv.writerows()
+        return(path)
+    
+    # write header and rows to CSV file
+    def writecsv(self,path,header,rows):
+        with open(path, 'w', encoding='UTF8') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+    
+    # import data from CSV, .npy or raw binary file to overlay on the plot of f(x)
+    # .npy and raw binary files are memory-mapped, nothing is read until displayed
+    # CSV files are parsed in one go by numpy.loadtxt()
+    # one column or 1D data: y values, x is the sample index
+    # two or more columns: first column x (ascending), second column y
+    def importdata(self):
+        my_filetypes = [('csv files', '.csv'), ('numpy files', '.npy'), ('raw binary files', ('.bin','.raw','.dat')), ('all files', '.*')]
+        path = filedialog.askopenfilename(parent=self,
+                                    initialdir=os.getcwd(),
+                                    title="Please select a file to import:",
+                                    filetypes=my_filetypes)
+        if (path=='') or (path==()): # no valid path given by dialog box
+            return
+        extension=os.path.splitext(path)[1].lower()
+        try:
+            if extension==".npy":
+                data=load(path, mmap_mode="r")
+            elif extension==".csv":
+                data=self.loadcsv(path)
+            else:
+                answer=simpledialog.askstring("Raw binary data","Data type of the samples (float64, float32, int16, ...)",initialvalue="float64")
+                if answer is None:
+                    return
+                data=memmap(path, dtype=dtype(answer), mode="r")
+        except (OSError,ValueError,TypeError) as inst:
+            tkinter.messagebox.showerror("Import not possible",str(inst))
+            return
+        if (data.ndim==2) and (data.shape[1]>=2):
+            self.datax=data[:,0]
+            self.datay=data[:,1]
+        elif (data.ndim==2) and (data.shape[1]==1):
+            self.datax=None
+            self.datay=data[:,0]
+        elif data.ndim==1:
+            self.datax=None
+            self.datay=data
+        else:
+            tkinter.messagebox.showerror("Import not possible","Data should have 1 or 2 columns")
+            return
+        if len(self.datay)<2:
+            self.cleardata()
+            tkinter.messagebox.showerror("Import not possible","File contains less than 2 samples")
+            return
+        # the x values should be ascending, decimate() and fitdata() search in them
+        if self.datax is not None:
+            if not isinstance(data,memmap) and not all(diff(self.datax)>=0):
+                order=argsort(self.datax,kind="stable") # CSV data is in RAM, sort it by x
+                self.datax=self.datax[order]
+                self.datay=self.datay[order]
+            if not (self.datax[0]<self.datax[-1]): # memory mapped data is only checked at both ends
+                self.cleardata()
+                tkinter.messagebox.showerror("Import not possible","First column should contain ascending x values")
+                return
+        # show the complete data set
+        if self.datax is None:
+            self.tstart=0.0
+            self.tstop=float(len(self.datay)-1)
+        else:
+            self.tstart=float(self.datax[0])
+            self.tstop=float(self.datax[-1])
+        self.xymode.set(False)
+        self.polarmode.set(False)
+        self.line3dmode.set(False)
+        self.surface3dmode.set(False)
+        self.complexmode.set(False)
+        self.odemode.set(False)
+        self.updatestartstoptxtbox()
+        self.update()
+        
+    # read CSV file using numpy.loadtxt(), skip a header line such as the one written by saveascsv()
+    def loadcsv(self,path):
+        with open(path, 'r', encoding='UTF8') as f:
+            firstline=f.readline()
+        try:
+            [float(v) for v in firstline.split(",")]
+            skip=0
+        except ValueError:
+            skip=1
+        return loadtxt(path, delimiter=",", skiprows=skip, ndmin=2)
     
+    # remove imported data from the plot
+    def cleardata(self):
+        self.datax=None
+        self.datay=None
+        self.update()
+
+    # live stream of samples from stdin or a local TCP port, shown next to f(x)
+    # the samples are collected in a Streambuffer by a reader thread
+    # the plot is redrawn at a fixed frame rate by self.streamframe()
+    def startstream(self):
+        if self.streambuffer is not None:
+            tkinter.messagebox.showerror("Live stream","Live stream is already running")
+            return
+        answer=simpledialog.askstring("Live stream","Read from stdin or from TCP port on localhost (enter port number)\n" \
+            "one value y or values x,y per line\nthe x interval is the width of the scrolling window",initialvalue="stdin")
+        if answer is None:
+            return
+        self.logx.set(False)
+        self.xymode.set(False)
+        self.polarmode.set(False)
+        self.line3dmode.set(False)
+        self.surface3dmode.set(False)
+        self.complexmode.set(False)
+        self.odemode.set(False)
+        if not self.update(): # reference function not correct
+            return
+        buffer=Streambuffer(self.Nstream)
+        try:
+            if answer.strip()=="stdin":
+                buffer.readfile(sys.stdin.buffer)
+            else:
+                buffer.listen(int(answer))
+        except (OSError,ValueError,AttributeError) as inst:
+            tkinter.messagebox.showerror("Live stream not possible",str(inst))
+            return
+        self.streambuffer=buffer
+        self.streamNtotal=0
+        self.after(self.streaminterval,self.streamframe)
+
+    # stop the live stream, the received samples stay on the plot as imported data
+    def stopstream(self):
+        if self.streambuffer is None:
+            return
+        self.streambuffer.stop()
+        x,y,Ntotal=self.streambuffer.snapshot()
+        self.streambuffer=None
+        self.streamline=None
+        self.streambackground=None
+        if len(y)>=2:
+            self.datax=x
+            self.datay=y
+        self.update()
+
+    # one frame of the live stream, runs every self.streaminterval ms using after()
+    # the next frame is planned after drawing, a slow frame delays it instead of piling up
+    def streamframe(self):
+        buffer=self.streambuffer
+        if buffer is None:
+            return
+        if buffer.error is not None:
+            self.stopstream()
+            tkinter.messagebox.showerror("Live stream",buffer.error)
+            return
+        framestart=time.perf_counter()
+        onplot=(self.streamline is not None) and (self.streamline.axes is self.ax)
+        if (buffer.Ntotal!=self.streamNtotal) or not onplot:
+            x,y,self.streamNtotal=buffer.snapshot()
+            if len(y)>0:
+                self.drawstream(x,y,onplot)
+        if self.streambuffer is buffer: # not stopped while drawing
+            elapsed=int((time.perf_counter()-framestart)*1000)
+            self.after(int(maximum(1,self.streaminterval-elapsed)),self.streamframe)
+
+    # show the samples of the stream, decimated to the visible interval
+    # only the line of the stream is drawn on the saved background (blitting)
+    # a complete redraw only when the window scrolls or the samples leave the y range
+    def drawstream(self,x,y,onplot):
+        if onplot:
+            left,right,bottom,top=self.streamlimits
+        if (not onplot) or (x[-1]>right) or (x[-1]<left): # scroll, newest sample at 3/4
+            width=self.tstop-self.tstart
+            left=x[-1]-0.75*width
+            right=left+width
+            onplot=False
+        xd,yd=self.decimate(x,y,left,right,self.Ndisplay)
+        finite=yd[isfinite(yd)]
+        if onplot and ((len(finite)==0) or ((finite.min()>=bottom) and (finite.max()<=top))):
+            self.streamline.set_data(xd,yd)
+            self.canvas.restore_region(self.streambackground)
+            self.ax.draw_artist(self.streamline)
+            self.canvas.blit(self.ax.bbox)
+        else:
+            self.plotstream(left,right,xd,yd,finite)
+
+    # complete redraw of reference function f(x) and stream for interval left..right
+    def plotstream(self,left,right,xd,yd,finite):
+        self.tstart=float(left)
+        self.tstop=float(right)
+        self.updatestartstoptxtbox()
+        try:
+            self.evaluate()
+        except (SyntaxError,NameError,TypeError) as inst:
+            self.stopstream()
+            tkinter.messagebox.showerror("Function not correct",inst.args[0])
+            return
+        self.evaluatedinputs=self.evaluationinputs()
+        modes=(self.odemode,self.complexmode,self.surface3dmode,self.polarmode,self.xymode,self.line3dmode)
+        if any([mode.get() for mode in modes]): # mode was changed, no plot of f(x)
+            self.stopstream()
+            tkinter.messagebox.showerror("Live stream","Live stream is only shown with a plot of f(x)")
+            return
+        canvas=self.canvas
+        self.canvas=Exportcanvas() # canvas drawn only once, after adding the stream
+        try:
+            self.plotfx()
+        finally:
+            self.canvas=canvas
+        bottom,top=self.ax.get_ylim()
+        if len(finite)>0:
+            margin=0.1*(finite.max()-finite.min())
+            bottom=minimum(bottom,finite.min()-margin)
+            top=maximum(top,finite.max()+margin)
+        self.ax.set_xlim(left,right)
+        self.ax.set_ylim(bottom,top)
+        self.streamlimits=(left,right,bottom,top)
+        self.streamline,=self.ax.plot(xd, yd, color=self.datacolor, linewidth=1, animated=True)
+        self.canvas.draw() # self.streamdraw() saves the background and draws the stream
+
+    # event handler after every complete redraw of the canvas, also after resizing
+    # the line of the stream is animated, it is not part of the saved background
+    def streamdraw(self,event):
+        if (self.streamline is not None) and (self.streamline.axes is self.ax):
+            self.streambackground=self.canvas.copy_from_bbox(self.ax.bbox)
+            self.ax.draw_artist(self.streamline)
+        
     # save plot als image file
     # using Figure.savefig() and filedialog.asksaveasfilename
     def saveasimg(self):
@@ -815,9 +1808,82 @@ class Plotter(tkinter.Tk):
                                     title="Please select a file name for saving:",
                                     filetypes=my_filetypes)
         if (path!='') and (path!=()): # als een geldig pad gegeven werd door dialoogbox
-            #self.update()
-            with open(path, 'w', encoding='UTF8') as f:
-                self.fig.savefig(path)
+            width,height=self.fig.get_size_inches()
+            self.startexport([(path,None)],width,height,self.fig.dpi)
+    
+    # export plot to several image formats, high resolution and tiles using extra window
+    def exportimages(self):
+        if len(self.get_toplevel_windows())==0: # no other Toplevel() window open yet
+            width,height=self.fig.get_size_inches()
+            self.exportwindow=Exportwindow()
+            self.exportwindow.nameentry.insert(tkinter.END,os.path.join(os.getcwd(),"plotter"))
+            self.exportwindow.dpientry.insert(tkinter.END,str(int(self.fig.dpi)))
+            self.exportwindow.widthentry.insert(tkinter.END,self.roundvaluestr(width,3))
+            self.exportwindow.heightentry.insert(tkinter.END,self.roundvaluestr(height,3))
+            self.exportwindow.tilesentry.insert(tkinter.END,"1")
+    
+    # list of (path, bbox) for every file to be written
+    # png is split in tiles x tiles files when tiles>1, bbox is the part of the figure in inches
+    def exportjobs(self,name,formats,width,height,tiles):
+        jobs=[]
+        for extension in formats:
+            if (extension=="png") and (tiles>1):
+                for row in range(tiles):
+                    for column in range(tiles):
+                        bbox=Bbox.from_bounds(column*width/tiles, (tiles-1-row)*height/tiles, width/tiles, height/tiles)
+                        jobs.append((f"{name}_{row+1}_{column+1}.png",bbox))
+            else:
+                jobs.append((name+"."+extension,None))
+        return(jobs)
+    
+    # copy of the Figure object as shown, with Agg canvas, size in inches and resolution
+    # made by pickling, so everything drawn on the plot is kept: integral fill, fitted curve,
+    # markers of the approximant and the error estimate text
+    # rendering is done later by savefig() in the export thread, the copy is not used by Tkinter
+    def exportfigure(self,width,height,dpi):
+        fig=pickle.loads(pickle.dumps(self.fig))
+        FigureCanvasAgg(fig)
+        fig.set_size_inches(width,height)
+        fig.set_dpi(dpi)
+        return(fig)
+    
+    # start writing the image files of jobs in a background thread
+    def startexport(self,jobs,width,height,dpi):
+        if (self.exportthread is not None) and self.exportthread.is_alive():
+            tkinter.messagebox.showerror("Export","Previous export is still running")
+            return
+        fig=self.exportfigure(width,height,dpi)
+        self.exportdone=0
+        self.exporterrors=[]
+        self.exportjoblist=jobs
+        self.exportthread=threading.Thread(target=self.renderexport,args=(fig,jobs),daemon=True)
+        self.exportthread.start()
+        self.after(100,self.checkexport)
+    
+    # runs in the export thread, does not touch any Tkinter object
+    def renderexport(self,fig,jobs):
+        for path,bbox in jobs:
+            try:
+                fig.savefig(path,bbox_inches=bbox)
+            except (OSError,ValueError,MemoryError) as inst:
+                self.exporterrors.append(os.path.basename(path)+": "+str(inst))
+            self.exportdone+=1
+    
+    # show progress of the export thread, called using after() until thread is finished
+    def checkexport(self):
+        running=self.exportthread.is_alive()
+        Njobs=len(self.exportjoblist)
+        if running:
+            status=f"Writing file {self.exportdone+1} of {Njobs}"
+        else:
+            status=f"{self.exportdone} of {Njobs} files written"
+        if (self.exportwindow is not None) and self.exportwindow.winfo_exists():
+            self.exportwindow.progressbar.configure(maximum=Njobs,value=self.exportdone)
+            self.exportwindow.statuslabel.configure(text=status)
+        if running:
+            self.after(100,self.checkexport)
+        elif len(self.exporterrors)>0:
+            tkinter.messagebox.showerror("Export","\n".join(self.exporterrors))
     
     
     # golden section search to find minimum of function
@@ -847,18 +1913,21 @@ class Plotter(tkinter.Tk):
     # find maximum function using goldensection search
     # uses simple dialog box containing a textbox
     def findmaximum(self):
-        if self.update(): #self.update() returns False when error in function            
+        if self.refresh(): #self.refresh() returns False when error in function            
             tolerance=1E-9
             Nmaxinterations=int(1E3)
-            m,N=self.gssmax(self.evalexpression,self.tstart,self.tstop,tolerance,Nmaxinterations)            
+            a,b=self.samplebracket(True) # search starts around the maximum of the evaluated samples
+            key=("maximum",self.txt,self.precision.get(),a,b,tolerance,Nmaxinterations) # a,b depend on the samples
+            m,N=self.cachedresult(key,lambda: self.gssmax(self.evalscalar,a,b,tolerance,Nmaxinterations))
             if not(isnan(m)):
                 mstr=f"{m:.9f}"
-                f=self.evalexpression(m)
+                f=self.evalscalar(m)
                 fstr=f"{f:.3e}"
                 Ninterations=Nmaxinterations-N
                 output="Function f(x) = "+self.txt+"\nInterval "+str(self.tstart)+" to "+str(self.tstop)
                 output+="\nMaximum at x= "+mstr+"\nMaximum of function f(xmax)= "+fstr
                 output+="\nNumber of iterations "+str(Ninterations)
+                output+="\nPrecision "+self.precision.get()
                 self.txtwindow=Txtwindow()
                 self.txtwindow.textbox.insert(tkinter.END, output)
                 self.txtwindow.title("Maximum of function")
@@ -866,28 +1935,255 @@ class Plotter(tkinter.Tk):
     # find minimum function using goldensection search
     # uses simple dialog box containing a textbox
     def findminimum(self):
-        if self.update(): #self.update() returns False when error in function            
+        if self.refresh(): #self.refresh() returns False when error in function            
             tolerance=1E-9
             Nmaxinterations=int(1E3)
-            m,N=self.gssmin(self.evalexpression,self.tstart,self.tstop,tolerance,Nmaxinterations)            
+            a,b=self.samplebracket(False) # search starts around the minimum of the evaluated samples
+            key=("minimum",self.txt,self.precision.get(),a,b,tolerance,Nmaxinterations) # a,b depend on the samples
+            m,N=self.cachedresult(key,lambda: self.gssmin(self.evalscalar,a,b,tolerance,Nmaxinterations))
             if not(isnan(m)):
                 mstr=f"{m:.9f}"
-                f=self.evalexpression(m)
+                f=self.evalscalar(m)
                 fstr=f"{f:.3e}"
                 Ninterations=Nmaxinterations-N
                 output="Function f(x) = "+self.txt+"\nInterval "+str(self.tstart)+" to "+str(self.tstop)
                 output+="\nMinimum at x= "+mstr+"\nMinimum of function f(xmin)= "+fstr
                 output+="\nNumber of iterations "+str(Ninterations)
+                output+="\nPrecision "+self.precision.get()
                 self.txtwindow=Txtwindow()
                 self.txtwindow.textbox.insert(tkinter.END, output)
                 self.txtwindow.title("Minimum of function")
      
                         
     
+    # power spectrum of the sampled function self.y in extra window of class Spectrumwindow
+    # uses the values of the plot, the function is only evaluated again when the inputs changed
+    def spectrum(self):
+        if self.refresh() and (len(self.get_toplevel_windows())==0):
+            if (type(self.y) is not ndarray) or (self.y.shape!=self.t.shape) or iscomplexobj(self.y):
+                tkinter.messagebox.showerror("Spectrum","Spectrum is only available for a plot of f(x)")
+                return
+            if self.logxactive():
+                tkinter.messagebox.showerror("Spectrum","Spectrum needs evenly spaced samples, turn off the logarithmic x axis")
+                return
+            self.spectrumwindow=Spectrumwindow()
+            self.spectrumwindow.segmententry.insert(tkinter.END,str(int(clip(next_fast_len(len(self.y)//8,real=True),16,len(self.y)))))
+            self.showspectrum()
+    
+    # calculate spectrum with settings of self.spectrumwindow and plot it in the window
+    def showspectrum(self):
+        window=self.spectrumwindow.windowchoice.get()
+        if self.spectrumwindow.welch.get():
+            try:
+                segment=int(eval(self.spectrumwindow.segmententry.get()))
+            except (SyntaxError,NameError,TypeError,ValueError):
+                tkinter.messagebox.showerror("Spectrum","Segment length should be a number",parent=self.spectrumwindow)
+                return
+            segment=int(clip(segment,8,len(self.y)))
+        else:
+            segment=None
+        self.frequencies,self.power=self.calculatespectrum(self.t,self.y,window,segment)
+        self.spectrumwindow.plot(self.frequencies,self.power,self.spectrumwindow.decibel.get())
+    
+    # one sided power spectrum of y sampled at x values t, using real FFT
+    # zero padding to the next length which is fast for the FFT
+    # Welch averaging over segments of length segment (50% overlap) when segment is given
+    # returns frequencies and power, power of a sine with amplitude A is A**2/2
+    def calculatespectrum(self,t,y,window,segment=None):
+        y=asarray(y,dtype=float64)
+        fs=(len(t)-1)/float(t[-1]-t[0]) # sample frequency
+        if segment is None:
+            w=get_window(window,len(y))
+            nfft=next_fast_len(len(y),real=True)
+            frequencies=rfftfreq(nfft,1/fs)
+            power=absolute(rfft(y*w,n=nfft))**2/sum(w)**2
+            power[1:]*=2 # one sided spectrum
+            if nfft%2==0:
+                power[-1]/=2 # Nyquist frequency appears only once
+        else:
+            frequencies,power=welch(y,fs=fs,window=window,nperseg=segment,noverlap=segment//2, \
+                nfft=next_fast_len(segment,real=True),detrend=False,scaling='spectrum')
+        return(frequencies,power)
+    
+    # save spectrum as CSV file
+    def savespectrum(self):
+        path=self.askcsvpath("spectrum.csv",parent=self.spectrumwindow)
+        if (path!='') and (path!=()):
+            self.writecsv(path,["frequency","power"],zip(self.frequencies,self.power))
+
+    # fit model expression with named parameters to imported data or to the samples of f(x)
+    # extra window of class Fitwindow
+    def curvefit(self):
+        if self.refresh() and (len(self.get_toplevel_windows())==0):
+            modes=(self.odemode,self.complexmode,self.surface3dmode,self.polarmode,self.xymode,self.line3dmode)
+            if any([mode.get() for mode in modes]) or (type(self.y) is not ndarray) or iscomplexobj(self.y):
+                tkinter.messagebox.showerror("Curve fit","Curve fit is only available for a plot of f(x)")
+                return
+            tolerance=1E-10
+            Nmaxinterations=200
+            self.fitwindow=Fitwindow()
+            self.fitwindow.modelentry.insert(tkinter.END,"a*x+b")
+            self.fitwindow.parametersentry.insert(tkinter.END,"a=1, b=0")
+            self.fitwindow.datachoice.set("imported data" if self.datay is not None else "samples of f(x)")
+            self.fitwindow.startentry.insert(tkinter.END,self.roundvaluestr(self.tstart,8))
+            self.fitwindow.stopentry.insert(tkinter.END,self.roundvaluestr(self.tstop,8))
+            self.fitwindow.toleranceentry.insert(tkinter.END,self.roundvaluestr(tolerance,8))
+            self.fitwindow.maxNentry.insert(tkinter.END,str(Nmaxinterations))
+            self.fitwindow.runfit()
+
+    # fit with the values of self.fitwindow, show result in the window and fitted curve on the plot
+    def showfit(self):
+        window=self.fitwindow
+        try:
+            names,p0=self.fitparameters(window.parametersentry.get())
+            model=self.fitmodel(window.modelentry.get(),names)
+            start=float(eval(window.startentry.get()))
+            stop=float(eval(window.stopentry.get()))
+            tolerance=float(eval(window.toleranceentry.get()))
+            Nmaxinterations=int(eval(window.maxNentry.get()))
+            if Nmaxinterations<1:
+                raise ValueError("Max. iterations should be at least 1")
+            x,y=self.fitdata(window.datachoice.get(),start,stop)
+            if len(y)<=len(p0):
+                raise ValueError(f"{len(y)} samples in interval, more than {len(p0)} needed")
+            p,covariance,residuals,Ninterations,converged=self.levenbergmarquardt(model,p0,x,y,tolerance,Nmaxinterations)
+        except (SyntaxError,NameError,TypeError,ValueError,ZeroDivisionError,linalg.LinAlgError) as inst:
+            tkinter.messagebox.showerror("Curve fit",str(inst),parent=window)
+            return
+        self.fitx,self.fity,self.fitresiduals=x,y,residuals
+        uncertainties=sqrt(absolute(diagonal(covariance)))
+        output="Model g(x) = "+window.modelentry.get()+"\nData "+window.datachoice.get()+", "+str(len(y))+" samples"
+        output+="\nInterval "+str(start)+" to "+str(stop)
+        for name,value,uncertainty in zip(names,p,uncertainties):
+            output+=f"\n{name} = {value:.12g} +/- {uncertainty:.3e}"
+        output+=f"\nRMS residual {sqrt(mean(residuals**2)):.6e}\nMax. residual {absolute(residuals).max():.6e}"
+        output+="\nNumber of iterations "+str(Ninterations)+("" if converged else ", not converged")
+        window.textbox.delete("1.0", "end")
+        window.textbox.insert(tkinter.END, output)
+        # fitted curve drawn over the plot of f(x) and the data
+        xs=linspace(x.min(),x.max(),self.N)
+        self.plotfx()
+        self.ax.plot(xs, model(p[newaxis,:],xs)[0], color=self.labelcolor, linewidth=self.linethickness, linestyle="--")
+        self.canvas.draw()
+
+    # names and initial values out of text such as "a=1, b=0"
+    def fitparameters(self,txt):
+        names=[]
+        values=[]
+        for part in txt.split(","):
+            parts=re.fullmatch(r"\s*([A-Za-z_]\w*)\s*=(.+)",part)
+            if parts is None:
+                raise ValueError("Parameters should be given as name=initial value, separated by commas")
+            names.append(parts.group(1))
+            values.append(float(eval(parts.group(2))))
+        if len(set(names))!=len(names) or ("x" in names):
+            raise ValueError("Parameter names should be different from each other and from x")
+        return(names,array(values,dtype=float64))
+
+    # model function g(P,x) for expression txt, P is (M,K) array with M sets of K parameter values
+    # returns (M,len(x)) array, all parameter sets calculated in one broadcast evaluation
+    def fitmodel(self,txt,names):
+        code=compile(txt,"model","eval")
+        def model(P,x):
+            namespace=dict(self.definitions)
+            namespace["x"]=x
+            namespace.update((name,P[:,n,newaxis]) for n,name in enumerate(names))
+            g=eval(code,globals(),namespace)
+            if iscomplexobj(g):
+                raise ValueError("Model gives complex values")
+            return(broadcast_to(asarray(g,dtype=float64),(len(P),len(x))))
+        return(model)
+
+    # samples in interval start..stop of imported data or of the evaluated f(x)
+    # at most self.Nfit samples, evenly spaced, non finite values are left out
+    def fitdata(self,source,start,stop):
+        if source=="imported data":
+            if self.datay is None:
+                raise ValueError("No imported data")
+            Ndata=len(self.datay)
+            if self.datax is None:
+                i0=int(clip(ceil(start),0,Ndata))
+                i1=int(clip(floor(stop)+1,0,Ndata))
+            else:
+                i0=int(searchsorted(self.datax,start,side="left"))
+                i1=int(searchsorted(self.datax,stop,side="right"))
+            step=int(maximum(1,ceil((i1-i0)/self.Nfit)))
+            y=asarray(self.datay[i0:i1:step],dtype=float64)
+            if self.datax is None:
+                x=arange(i0,i1,step,dtype=float64)
+            else:
+                x=asarray(self.datax[i0:i1:step],dtype=float64)
+        else:
+            inside=(self.t>=start) & (self.t<=stop)
+            x=asarray(self.t[inside],dtype=float64)
+            y=asarray(self.y[inside],dtype=float64)
+        finite=isfinite(x) & isfinite(y)
+        return(x[finite],y[finite])
+
+    # Levenberg-Marquardt least squares fit of model(P,x) to y, starting at parameters p0
+    # Jacobian by central differences from self.fitjacobian()
+    # several damping values are tried at once, the step with the lowest sum of squares is taken
+    # returns parameters, covariance, residuals, number of iterations and convergence
+    def levenbergmarquardt(self,model,p0,x,y,tolerance,Nmax):
+        K=len(p0)
+        p=p0.copy()
+        damping=1E-3
+        factors=10.0**arange(-1,3) # damping values tried in one iteration, relative to damping
+        converged=False
+        for n in range(Nmax):
+            g,J=self.fitjacobian(model,p,x)
+            residuals=y-g
+            cost=residuals@residuals
+            A=J.T@J
+            gradient=J.T@residuals
+            scale=maximum(diagonal(A),1E-12*diagonal(A).max()+finfo(float64).tiny)
+            dampings=damping*factors
+            steps=linalg.solve(A+dampings[:,newaxis,newaxis]*diag(scale),broadcast_to(gradient,(len(dampings),K))[...,newaxis])[...,0]
+            costs=nan_to_num(sum((y-model(p+steps,x))**2,axis=1),nan=inf)
+            best=argmin(costs)
+            if costs[best]<cost:
+                p=p+steps[best]
+                damping=dampings[best]
+                if (sqrt(steps[best]@steps[best])<=tolerance*(sqrt(p@p)+tolerance)) or (cost-costs[best]<=tolerance*cost):
+                    converged=True
+                    break
+            elif damping>1E16: # no smaller sum of squares found, minimum reached within precision
+                converged=True
+                break
+            else:
+                damping=dampings[-1]*10
+        # covariance from the Jacobian at the final parameters
+        g,J=self.fitjacobian(model,p,x)
+        residuals=y-g
+        variance=(residuals@residuals)/maximum(len(y)-K,1)
+        covariance=linalg.pinv(J.T@J)*variance
+        return(p,covariance,residuals,n+1,converged)
+
+    # model values g and Jacobian J (len(x),K) at parameters p using central differences
+    # p, p+h and p-h for every parameter are calculated in one model call
+    def fitjacobian(self,model,p,x):
+        K=len(p)
+        h=cbrt(finfo(float64).eps)*maximum(absolute(p),1)
+        G=model(vstack((p,p+diag(h),p-diag(h))),x)
+        J=((G[1:K+1]-G[K+1:])/(2*h[:,newaxis])).T
+        return(G[0],J)
+
+    # save data, fitted values and residuals of the last fit as CSV file
+    def savefit(self):
+        if self.fitx is None:
+            return
+        path=self.askcsvpath("fit.csv",parent=self.fitwindow)
+        if (path!='') and (path!=()):
+            fitted=self.fity-self.fitresiduals
+            self.writecsv(path,["x","y","fit","residual"],zip(self.fitx,self.fity,fitted,self.fitresiduals))
+    
     # integraal calculated of functie with extra window
     # extra window of class self.findnumericwindow
     def findintegralscipyquad(self):
-        if self.update() and (len(self.get_toplevel_windows())==0) \
+        if self.refresh() and self.surface3dmode.get(): # f(x,y) is integrated over x and y
+            self.finddoubleintegral()
+            return
+        if self.refresh() and (len(self.get_toplevel_windows())==0) \
             and (self.xymode.get()==False): #update succesvol en nog geen ander Toplevel() venster open
             tolerance=1E-8
             Nmaxinterations=5000
@@ -911,17 +2207,186 @@ class Plotter(tkinter.Tk):
         tolerance=eval(self.findnumericwindow.toleranceentry.get())
         Nmaxinterations=eval(self.findnumericwindow.maxNentry.get())
         # de Scipy integrate.quad functie gebruiken om de integraal te vinden
-        (res,abserror)=quad(self.evalexpression,start,stop,epsabs=tolerance, \
-            limit=Nmaxinterations)
+        key=("integral",self.txt,self.precision.get(),start,stop,tolerance,Nmaxinterations)
+        (res,abserror)=self.cachedresult(key,lambda: quad(self.evalscalar,start,stop,epsabs=tolerance, \
+            limit=Nmaxinterations))
         resstr=f"{res:.12f}"
         abserrorstr=f"{abserror:.12e}"
         output="Function f(x) = "+self.txt+"\nInterval "+str(start)+" to "+str(stop)
         output+="\nIntegral over interval "+resstr+"\nAbsolute error "+abserrorstr
+        output+="\nPrecision "+self.precision.get()
         self.findnumericwindow.textbox.delete("1.0", "end")
         self.findnumericwindow.textbox.insert(tkinter.END, output)
         # plotfx(self,fillstart=0.0,fillstop=1.0,fillshow=False)
         if (self.polarmode.get()==False) and (self.xymode.get()==False):
             self.plotfx(fillstart=start,fillstop=stop,fillshow=True)
+
+    # double integral of f(x,y) over the square of the 3D surface plot with extra window
+    # extra window of class Findnumericwindow, max. number of iterations is the number of refinement levels
+    def finddoubleintegral(self):
+        if self.refresh() and (len(self.get_toplevel_windows())==0):
+            if not self.surface3dmode.get():
+                tkinter.messagebox.showerror("Double integral","Double integral is only available for a 3D surface plot of f(x,y)")
+                return
+            tolerance=1E-8
+            Nmaxinterations=12
+            self.findnumericwindow=Findnumericwindow("double integral")
+            self.findnumericwindow.startentry.insert(tkinter.END,self.roundvaluestr(self.tstart,8))
+            self.findnumericwindow.stopentry.insert(tkinter.END,self.roundvaluestr(self.tstop,8))
+            self.findnumericwindow.toleranceentry.insert(tkinter.END,self.roundvaluestr(tolerance,8))
+            self.findnumericwindow.maxNentry.insert(tkinter.END,str(Nmaxinterations))
+            self.findnumericwindow.runnumeric()
+
+    # double integral with values from the extra window, x and y both from start to stop
+    def showdoubleintegral(self):
+        start=eval(self.findnumericwindow.startentry.get())
+        stop=eval(self.findnumericwindow.stopentry.get())
+        tolerance=eval(self.findnumericwindow.toleranceentry.get())
+        Nmaxinterations=eval(self.findnumericwindow.maxNentry.get())
+        key=("double integral",self.txt,self.precision.get(),start,stop,tolerance,Nmaxinterations)
+        try:
+            res,abserror,Nevaluations,Nlevels,converged=self.cachedresult(key, \
+                lambda: self.doubleintegral(start,stop,start,stop,tolerance,Nmaxinterations))
+        except (SyntaxError,NameError,TypeError,ValueError) as inst:
+            tkinter.messagebox.showerror("Double integral",str(inst),parent=self.findnumericwindow)
+            return
+        output="Function f(x,y) = "+self.txt+"\nx and y from "+str(start)+" to "+str(stop)
+        output+=f"\nDouble integral {res:.12f}\nEstimated absolute error {abserror:.12e}"
+        output+=f"\n{Nevaluations} evaluations in {Nlevels} iterations"
+        if not converged:
+            output+="\nTolerance not reached, increase max. number of iterations or tolerance"
+        output+="\nPrecision "+self.precision.get()
+        self.findnumericwindow.textbox.delete("1.0", "end")
+        self.findnumericwindow.textbox.insert(tkinter.END, output)
+
+    # integral of f(x,y) over xa..xb, ya..yb by adaptive cubature
+    # every cell has a tensor product Gauss-Legendre rule with n x n nodes
+    # per refinement level all cells not accepted yet are split in 4, the nodes of all
+    # new cells are evaluated in one call, the difference between the 4 children and their
+    # parent is the error estimate, a cell is accepted when this error is below its share of
+    # the tolerance, at most self.Ncubature nodes per level
+    # returns integral, error estimate, number of evaluations, levels and convergence
+    def doubleintegral(self,xa,xb,ya,yb,tolerance,Nlevels,n=8):
+        nodes,weights=legendre.leggauss(n)
+        precision=self.precision.get()
+        def cellintegrals(cx,cy,hx,hy):
+            X=(cx[:,newaxis,newaxis]+hx*nodes[newaxis,:,newaxis]).astype(precision)
+            Y=(cy[:,newaxis,newaxis]+hy*nodes[newaxis,newaxis,:]).astype(precision)
+            F=broadcast_to(asarray(self.evalexpression(X,Y)),(len(cx),n,n))
+            if iscomplexobj(F):
+                raise ValueError("Double integral only for real functions")
+            return(hx*hy*einsum("kij,i,j->k",F.astype(float64),weights,weights))
+        hx=(xb-xa)/2
+        hy=(yb-ya)/2
+        cx=array([xa+hx],dtype=float64)
+        cy=array([ya+hy],dtype=float64)
+        parents=cellintegrals(cx,cy,hx,hy)
+        Nevaluations=n*n
+        total=0.0
+        error=0.0
+        converged=False
+        Nlevels=int(maximum(Nlevels,1)) # at least one refinement for an error estimate
+        for level in range(Nlevels):
+            hx/=2
+            hy/=2
+            cx=(cx[:,newaxis]+array([-hx,hx,-hx,hx])).ravel()
+            cy=(cy[:,newaxis]+array([-hy,-hy,hy,hy])).ravel()
+            children=cellintegrals(cx,cy,hx,hy).reshape(-1,4)
+            Nevaluations+=children.size*n*n
+            fine=children.sum(axis=1)
+            errors=absolute(fine-parents)
+            done=errors<=tolerance/4**level # share of the tolerance for a parent cell
+            total+=fine[done].sum()
+            error+=errors[done].sum()
+            if done.all():
+                converged=True
+                break
+            if (level==Nlevels-1) or (4*children[~done].size*n*n>self.Ncubature):
+                total+=fine[~done].sum()
+                error+=errors[~done].sum()
+                break
+            cx=cx.reshape(-1,4)[~done].ravel()
+            cy=cy.reshape(-1,4)[~done].ravel()
+            parents=children[~done].ravel()
+        return(float(total),float(error),Nevaluations,level+1,converged)
+
+    # Chebyshev approximant of f(x) with extra window of class Findnumericwindow
+    # gives all roots, extrema and the integral, and when converged it is used for plotting inside its interval
+    def findapproximant(self):
+        if self.refresh() and (len(self.get_toplevel_windows())==0):
+            modes=(self.odemode,self.complexmode,self.surface3dmode,self.polarmode,self.xymode,self.line3dmode)
+            if any([mode.get() for mode in modes]) or (type(self.y) is not ndarray) or iscomplexobj(self.y):
+                tkinter.messagebox.showerror("Chebyshev approximant","Approximant is only available for a plot of f(x)")
+                return
+            tolerance=float(maximum(1E-13,64*finfo(self.precision.get()).eps))
+            Nmaxinterations=10 # levels of Chebyshev points, 17 to 16385 points
+            self.findnumericwindow=Findnumericwindow("approximant","Build")
+            self.findnumericwindow.startentry.insert(tkinter.END,self.roundvaluestr(self.tstart,8))
+            self.findnumericwindow.stopentry.insert(tkinter.END,self.roundvaluestr(self.tstop,8))
+            self.findnumericwindow.toleranceentry.insert(tkinter.END,self.roundvaluestr(tolerance,8))
+            self.findnumericwindow.maxNentry.insert(tkinter.END,str(Nmaxinterations))
+            self.findnumericwindow.runnumeric()
+
+    # build approximant with values from the extra window, show roots, extrema and integral
+    # roots and extrema are marked on the plot
+    def showapproximant(self):
+        start=eval(self.findnumericwindow.startentry.get())
+        stop=eval(self.findnumericwindow.stopentry.get())
+        tolerance=eval(self.findnumericwindow.toleranceentry.get())
+        Nmaxinterations=eval(self.findnumericwindow.maxNentry.get())
+        key=("approximant",self.txt,self.precision.get(),start,stop,tolerance,Nmaxinterations)
+        try:
+            proxy=self.cachedresult(key,lambda: self.buildapproximant(start,stop,tolerance,Nmaxinterations))
+        except (SyntaxError,NameError,TypeError,ValueError) as inst:
+            tkinter.messagebox.showerror("Chebyshev approximant",str(inst),parent=self.findnumericwindow)
+            return
+        output="Function f(x) = "+self.txt+"\nInterval "+str(start)+" to "+str(stop)
+        output+=f"\nDegree {len(proxy.c)-1}, {proxy.Nevaluations} evaluations in {proxy.Nlevels} iterations"
+        if proxy.converged:
+            roots=proxy.roots()
+            x,curvature=proxy.extrema()
+            output+=self.listedpoints("Roots",roots,None)
+            output+=self.listedpoints("Maxima",x[curvature<0],proxy)
+            output+=self.listedpoints("Minima",x[curvature>0],proxy)
+            candidates=append(x,[proxy.a,proxy.b])
+            values=proxy(candidates)
+            output+=f"\nLargest value {values.max():.12g} at x= {candidates[argmax(values)]:.12f}"
+            output+=f"\nSmallest value {values.min():.12g} at x= {candidates[argmin(values)]:.12f}"
+        else:
+            output+="\nNot converged, increase max. number of iterations or tolerance"
+            output+="\nPlot uses the expression, not the approximant"
+        output+=f"\nIntegral over interval {proxy.integral(proxy.a,proxy.b):.12f}"
+        output+="\nPrecision "+self.precision.get()
+        self.findnumericwindow.textbox.delete("1.0", "end")
+        self.findnumericwindow.textbox.insert(tkinter.END, output)
+        if not proxy.converged: # approximant not accurate enough for plotting
+            return
+        # plot f(x) using the approximant
+        self.proxy=proxy
+        self.proxyinputs=(self.txt,self.definitions,self.precision.get())
+        self.proxymode.set(True)
+        if self.update():
+            roots=roots[(roots>=self.tstart) & (roots<=self.tstop)]
+            x=x[(x>=self.tstart) & (x<=self.tstop)]
+            self.ax.plot(roots, zeros(len(roots)), color=self.labelcolor, marker="o", linestyle="none")
+            self.ax.plot(x, proxy(x), color=self.labelcolor, marker="D", linestyle="none")
+            self.canvas.draw()
+
+    # Chebyshev approximant of the expression on start..stop, evaluated in the selected precision
+    def buildapproximant(self,start,stop,tolerance,Nlevels):
+        precision=self.precision.get()
+        return(Chebyshevproxy(lambda x: self.evalexpression(x.astype(precision)),start,stop,tolerance,Nlevels))
+
+    # text with the number of points and the first Nshow x values, and f(x) when proxy is given
+    def listedpoints(self,name,x,proxy,Nshow=20):
+        output=f"\n{name} ({len(x)}):"
+        for value in x[:Nshow]:
+            output+=f"\n  x= {value:.12f}"
+            if proxy is not None:
+                output+=f"  f(x)= {float(proxy(value)):.12g}"
+        if len(x)>Nshow:
+            output+="\n  ..."
+        return(output)
         
 
     # even handler for key presses
@@ -951,6 +2416,313 @@ class Plotter(tkinter.Tk):
          
         
 
+# stands in for the FigureCanvasTkAgg object when a plot is built without drawing it
+# used by the Renderer and for the live stream, drawing happens later
+class Exportcanvas:
+    def draw(self):
+        pass
+    
+    def draw_idle(self):
+        pass
+
+
+# user defined function name(arguments)=expression, node of the recompute graph
+# the result for the last array arguments is kept, it is only calculated again when
+# called with other arrays or when this function or one it depends on is redefined
+class Definedfunction:
+    def __init__(self,name,args,body,definitions):
+        self.name=name
+        self.args=args
+        self.body=body
+        self.code=compile(body,name,"eval") # SyntaxError for incorrect expression
+        self.definitions=definitions # dict with all defined functions, shared by all
+        self.dependencies=set()
+        self.cachedargs=None
+        self.cachedresult=None
+        
+    def __call__(self,*values):
+        if len(values)!=len(self.args):
+            raise TypeError(f"{self.name}() takes {len(self.args)} arguments")
+        arrays=any([type(value) is ndarray for value in values])
+        if arrays and (self.cachedargs is not None) and \
+            all([value is cached for value,cached in zip(values,self.cachedargs)]):
+            return(self.cachedresult)
+        namespace=dict(self.definitions)
+        namespace.update(zip(self.args,values))
+        result=eval(self.code,globals(),namespace)
+        if arrays: # references to the arrays are kept, so identity check stays valid
+            self.cachedargs=values
+            self.cachedresult=result
+        return(result)
+
+
+# Chebyshev interpolant of function f on interval a..b, used as proxy for f
+# f is called with an ndarray of x values once per level with 17, 33, 65, ... Chebyshev points,
+# the values of the previous level are reused, only the new points are evaluated
+# the coefficients come from a DCT of the values, building stops when they decayed below tolerance
+# roots, extrema and integrals are then calculated from the coefficients
+class Chebyshevproxy:
+    def __init__(self,f,a,b,tolerance=1E-13,Nlevels=12,Nsplit=64):
+        self.a=float(a)
+        self.b=float(b)
+        self.tolerance=tolerance
+        self.Nsplit=Nsplit # max. degree for roots from one colleague matrix
+        n=17
+        values=self.sample(f,self.points(n))
+        self.Nevaluations=n
+        self.converged=False
+        for level in range(Nlevels):
+            c=self.coefficients(values)
+            chopped=self.chop(c)
+            if chopped is not None:
+                c=chopped
+                self.converged=True
+                break
+            if level==Nlevels-1:
+                break
+            n=2*n-1
+            new=self.sample(f,self.points(n)[1::2]) # points of previous level are the even points
+            previous=values
+            values=empty(n)
+            values[0::2]=previous
+            values[1::2]=new
+            self.Nevaluations+=len(new)
+        self.c=c
+        self.Nlevels=level+1
+
+    # Chebyshev points of the second kind in a..b, from b to a
+    def points(self,n):
+        return((self.a+self.b)/2+(self.b-self.a)/2*cos(pi*arange(n)/(n-1)))
+
+    def sample(self,f,x):
+        values=broadcast_to(asarray(f(x)),x.shape)
+        if iscomplexobj(values):
+            raise ValueError("Approximant only for real functions")
+        values=asarray(values,dtype=float64)
+        if not isfinite(values).all():
+            raise ValueError("Function not finite on interval")
+        return(values)
+
+    # Chebyshev coefficients of the interpolant through values in self.points(), using DCT-I
+    def coefficients(self,values):
+        c=dct(values,type=1)/(len(values)-1)
+        c[0]/=2
+        c[-1]/=2
+        return(c)
+
+    # coefficients without the tail below tolerance relative to the largest coefficient
+    # None when the last coefficients did not decay yet, more points are needed
+    def chop(self,c):
+        limit=self.tolerance*absolute(c).max()
+        Ntail=int(maximum(3,len(c)//8))
+        if absolute(c[-Ntail:]).max()>limit:
+            return(None)
+        large=flatnonzero(absolute(c)>limit)
+        return(c[:large[-1]+1] if len(large)>0 else c[:1])
+
+    # values of the interpolant for x inside a..b, Clenshaw recurrence for all x at once
+    def __call__(self,x):
+        return(chebyshev.chebval((2*x-(self.a+self.b))/(self.b-self.a),self.c))
+
+    # all real roots in a..b
+    def roots(self):
+        return(self.subroots(self.c,self.a,self.b))
+
+    # x values in a..b where the derivative is zero, with second derivative there
+    def extrema(self):
+        scale=2/(self.b-self.a)
+        derivative=chebyshev.chebder(self.c)*scale
+        x=self.subroots(derivative,self.a,self.b)
+        curvature=chebyshev.chebval((2*x-(self.a+self.b))/(self.b-self.a),chebyshev.chebder(derivative)*scale)
+        return(x,curvature)
+
+    # integral from start to stop, both inside a..b
+    def integral(self,start,stop):
+        antiderivative=chebyshev.chebint(self.c)*(self.b-self.a)/2
+        X=(2*array([start,stop],dtype=float64)-(self.a+self.b))/(self.b-self.a)
+        F=chebyshev.chebval(X,antiderivative)
+        return(F[1]-F[0])
+
+    # roots of series c on a..b using the eigenvalues of the colleague matrix
+    # a series of high degree is split in two halves first, each resampled in
+    # Chebyshev points and chopped, so the matrices stay small
+    def subroots(self,c,a,b):
+        if len(c)<=1:
+            return(empty(0))
+        if len(c)<=self.Nsplit:
+            r=chebyshev.chebroots(c)
+            r=real(r[(absolute(imag(r))<1E-8) & (absolute(real(r))<=1+1E-8)])
+            return(sort((a+b)/2+(b-a)/2*clip(r,-1,1)))
+        middle=(a+b)/2-0.004*(b-a)/2 # not exactly in the middle, a root there is often special
+        n=len(c)
+        halves=[]
+        for start,stop in ((a,middle),(middle,b)):
+            x=(start+stop)/2+(stop-start)/2*cos(pi*arange(n)/(n-1))
+            values=chebyshev.chebval((2*x-(a+b))/(b-a),c)
+            ch=self.coefficients(values)
+            chopped=self.chop(ch)
+            halves.append(self.subroots(ch if chopped is None else chopped,start,stop))
+        r=concatenate(halves)
+        if len(r)>1: # root at middle found in both halves
+            r=r[append(True,diff(r)>1E-12*(b-a))]
+        return(r)
+
+
+# preallocated ring buffer for the samples of a live stream, filled by a reader thread
+# the stream is text, one value y or values x,y per line (comma or space separated)
+# the oldest samples are overwritten when the buffer is full
+# back-pressure: when a full buffer was written since the last snapshot, the reader
+# waits for the display, the pipe or socket fills up and the producer is blocked
+class Streambuffer:
+    def __init__(self,Nbuffer=100000,Nchunk=65536):
+        self.Nbuffer=Nbuffer
+        self.Nchunk=Nchunk # max. number of bytes read at once
+        self.x=empty(Nbuffer,dtype=float64)
+        self.y=empty(Nbuffer,dtype=float64)
+        self.Ntotal=0 # number of samples received
+        self.Nunseen=0 # number of samples received since the last snapshot
+        self.Ncolumns=None # number of values per line, taken from the first line
+        self.rest=b"" # incomplete last line of the previous chunk
+        self.condition=threading.Condition()
+        self.running=True
+        self.error=None # error message from the reader thread
+        self.server=None # listening socket
+
+    # read samples from a binary file object such as sys.stdin.buffer
+    def readfile(self,f):
+        threading.Thread(target=self.readloop,args=(f,),daemon=True).start()
+
+    # read samples from connections on a TCP port of localhost, one connection at a time
+    # OSError raised here when the port can not be used
+    def listen(self,port):
+        self.server=socket.create_server(("127.0.0.1",port))
+        self.server.settimeout(0.5)
+        threading.Thread(target=self.serveloop,daemon=True).start()
+
+    def readloop(self,f):
+        try:
+            while self.running:
+                chunk=f.read1(self.Nchunk)
+                if len(chunk)==0: # end of file
+                    break
+                self.add(chunk)
+        except (OSError,ValueError) as inst:
+            self.error=str(inst)
+
+    def serveloop(self):
+        while self.running:
+            try:
+                connection,address=self.server.accept()
+            except socket.timeout:
+                continue
+            except OSError as inst:
+                if self.running:
+                    self.error=str(inst)
+                break
+            connection.settimeout(0.5)
+            with connection:
+                while self.running:
+                    try:
+                        chunk=connection.recv(self.Nchunk)
+                    except socket.timeout:
+                        continue
+                    except OSError:
+                        break
+                    if len(chunk)==0: # connection closed by producer
+                        break
+                    self.add(chunk)
+            self.rest=b""
+
+    # parse chunk and append the samples, waits while the display is behind
+    def add(self,chunk):
+        values=self.parse(chunk)
+        if len(values)==0:
+            return
+        with self.condition:
+            while self.running and (self.Nunseen>=self.Nbuffer):
+                self.condition.wait(0.5)
+            self.append(values)
+
+    # convert the complete lines in chunk to an (N,Ncolumns) array
+    # all values are converted at once, line by line only when some lines are not correct
+    def parse(self,chunk):
+        data=self.rest+chunk
+        end=data.rfind(b"\n")+1
+        self.rest=data[end:]
+        lines=data[:end].replace(b",",b" ").split(b"\n")
+        if self.Ncolumns is None:
+            for line in lines:
+                fields=line.split()
+                try:
+                    [float(v) for v in fields]
+                except ValueError: # header line
+                    continue
+                if len(fields)>0:
+                    self.Ncolumns=len(fields)
+                    break
+            if self.Ncolumns is None:
+                return(empty((0,1)))
+        tokens=data[:end].replace(b",",b" ").split()
+        if len(tokens)==self.Ncolumns*(len(lines)-1):
+            try:
+                return(array(tokens,dtype=float64).reshape(-1,self.Ncolumns))
+            except ValueError:
+                pass
+        rows=[]
+        for line in lines:
+            fields=line.split()
+            if len(fields)==self.Ncolumns:
+                try:
+                    rows.append([float(v) for v in fields])
+                except ValueError:
+                    pass
+        return(array(rows,dtype=float64).reshape(-1,self.Ncolumns))
+
+    # write samples in the ring buffer, x is the sample number when there is one column
+    # only the last Nbuffer samples are written when there are more
+    def append(self,values):
+        N=len(values)
+        if self.Ncolumns==1:
+            x=arange(self.Ntotal,self.Ntotal+N,dtype=float64)
+            y=values[:,0]
+        else:
+            x=values[:,0]
+            y=values[:,1]
+        Nwrite=int(minimum(N,self.Nbuffer))
+        start=(self.Ntotal+N-Nwrite)%self.Nbuffer
+        Nfirst=int(minimum(Nwrite,self.Nbuffer-start)) # samples before wrapping around
+        self.x[start:start+Nfirst]=x[N-Nwrite:N-Nwrite+Nfirst]
+        self.y[start:start+Nfirst]=y[N-Nwrite:N-Nwrite+Nfirst]
+        self.x[:Nwrite-Nfirst]=x[N-Nwrite+Nfirst:]
+        self.y[:Nwrite-Nfirst]=y[N-Nwrite+Nfirst:]
+        self.Ntotal+=N
+        self.Nunseen+=N
+
+    # copy of the samples in the buffer, oldest first, and the number of samples received
+    # the reader is allowed to continue
+    def snapshot(self):
+        with self.condition:
+            start=self.Ntotal%self.Nbuffer
+            if self.Ntotal<=self.Nbuffer:
+                x=self.x[:self.Ntotal].copy()
+                y=self.y[:self.Ntotal].copy()
+            else:
+                x=concatenate((self.x[start:],self.x[:start]))
+                y=concatenate((self.y[start:],self.y[:start]))
+            self.Nunseen=0
+            self.condition.notify_all()
+            return(x,y,self.Ntotal)
+
+    # stop the reader thread, a read from stdin which is blocking can not be interrupted
+    # the daemon thread then stops at the next line or at exit
+    def stop(self):
+        with self.condition:
+            self.running=False
+            self.condition.notify_all()
+        if self.server is not None:
+            self.server.close()
+
+
 # class for window with textbox and ok button
 class Txtwindow(tkinter.Toplevel): # inherits van Tkinter.Toplevel
     def __init__(self): 
@@ -975,14 +2747,14 @@ class Txtwindow(tkinter.Toplevel): # inherits van Tkinter.Toplevel
 # dialogbox for numerical methods with multiple entry boxes, labels and a  textbox
 # based onTkinter.toplevel        
 class Findnumericwindow(tkinter.Toplevel): # erft van Tkinter.Toplevel
-    def __init__(self,action): 
+    def __init__(self,action,verb="Find"): 
         super().__init__()
         self.action=action # actie which Findnumericwindow is used for
         self.title(self.action.capitalize())
         
         # buttons defined
         self.okbutton=ttk.Button(master=self, text="Close", width=15, command=self.destroy)
-        self.gobutton=ttk.Button(master=self, text="Find "+self.action, width=15, command=self.runnumeric)
+        self.gobutton=ttk.Button(master=self, text=verb+" "+self.action, width=15, command=self.runnumeric)
         
         # labels and entries defined
         self.startlabel=ttk.Label(master=self, text="Start x value")
@@ -1029,9 +2801,540 @@ class Findnumericwindow(tkinter.Toplevel): # erft van Tkinter.Toplevel
                 self.master.showroot() 
             case "integral":
                 self.master.showintegralscipyquad()
+            case "approximant":
+                self.master.showapproximant()
+            case "double integral":
+                self.master.showdoubleintegral()
+
+
+# dialogbox for fitting a model with parameters to data
+# based on Tkinter.toplevel
+class Fitwindow(tkinter.Toplevel):
+    def __init__(self):
+        super().__init__()
+        self.title("Curve fit")
+
+        # buttons defined
+        self.okbutton=ttk.Button(master=self, text="Close", width=15, command=self.destroy)
+        self.savebutton=ttk.Button(master=self, text="Save as CSV", width=15, command=self.master.savefit)
+        self.gobutton=ttk.Button(master=self, text="Fit", width=15, command=self.runfit)
+
+        # labels and entries defined
+        self.modellabel=ttk.Label(master=self, text="Model g(x) with parameters, for example a*exp(-b*x)+c")
+        self.modelentry=tkinter.Entry(master=self, width="40",font=("FreeMono",12,"bold"),insertwidth=2)
+        self.modelentry.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.parameterslabel=ttk.Label(master=self, text="Parameters with initial values, for example a=1, b=0.5, c=0")
+        self.parametersentry=tkinter.Entry(master=self, width="40",font=("FreeMono",12,"bold"),insertwidth=2)
+        self.parametersentry.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.datalabel=ttk.Label(master=self, text="Data")
+        self.datachoice=ttk.Combobox(master=self, values=("imported data","samples of f(x)"), state="readonly", width=15)
+        self.startlabel=ttk.Label(master=self, text="Start x value")
+        self.startentry=tkinter.Entry(master=self, width="15",font=("FreeMono",12,"bold"),insertwidth=2)
+        self.startentry.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.stoplabel=ttk.Label(master=self, text="Stop x value")
+        self.stopentry=tkinter.Entry(master=self, width="15",font=("FreeMono",12,"bold"),insertwidth=2)
+        self.stopentry.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.tolerancelabel=ttk.Label(master=self, text="Tolerance")
+        self.toleranceentry=tkinter.Entry(master=self, width="15",font=("FreeMono",12,"bold"),insertwidth=2)
+        self.toleranceentry.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.maxNlabel=ttk.Label(master=self, text="Max. number of iterations")
+        self.maxNentry=tkinter.Entry(master=self, width="15",font=("FreeMono",12,"bold"),insertwidth=2)
+        self.maxNentry.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.textlabel=ttk.Label(master=self, text="Result")
+
+        # textbox for output defined
+        self.textbox=tkinter.Text(self, width=40, height=10,font=("FreeMono",12,"bold"),insertwidth=2)
+        self.textbox.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+
+        # widgets aligned using grid()
+        self.modellabel.grid(row=0,column=0,columnspan=2,sticky="WENS")
+        self.modelentry.grid(row=1,column=0,columnspan=2,sticky="WENS")
+        self.parameterslabel.grid(row=2,column=0,columnspan=2,sticky="WENS")
+        self.parametersentry.grid(row=3,column=0,columnspan=2,sticky="WENS")
+        self.datalabel.grid(row=4,column=0,sticky="WENS")
+        self.datachoice.grid(row=4,column=1,sticky="WENS")
+        self.startlabel.grid(row=5,column=0,sticky="WENS")
+        self.startentry.grid(row=6,column=0,sticky="WENS")
+        self.stoplabel.grid(row=5,column=1,sticky="WENS")
+        self.stopentry.grid(row=6,column=1,sticky="WENS")
+        self.tolerancelabel.grid(row=7,column=0,sticky="WENS")
+        self.toleranceentry.grid(row=8,column=0,sticky="WENS")
+        self.maxNlabel.grid(row=7,column=1,sticky="WENS")
+        self.maxNentry.grid(row=8,column=1,sticky="WENS")
+        self.textlabel.grid(row=9,column=0,columnspan=2,sticky="WENS")
+        self.textbox.grid(row=10,column=0,columnspan=2,sticky="WENS")
+        self.savebutton.grid(row=11,column=0,columnspan=2,sticky="WENS")
+        self.okbutton.grid(row=12,column=0,sticky="WENS")
+        self.gobutton.grid(row=12,column=1,sticky="WENS")
+
+        # define which row and columns scale
+        self.rowconfigure(10, weight = 1)
+        self.columnconfigure(0, weight = 1)
+        self.columnconfigure(1, weight = 1)
+
+    # fit model to data using the main window
+    def runfit(self):
+        self.master.showfit()
+
+
+# window with textbox for the user defined functions
+# based on Tkinter.toplevel
+class Definitionswindow(tkinter.Toplevel):
+    def __init__(self): 
+        super().__init__()
+        self.title("Function definitions")
+        self.infolabel=ttk.Label(master=self, text="One function per line, for example g(x)=exp(-x**2)")
+        self.textbox=tkinter.Text(self, width=50, height=10,font=("FreeMono",12,"bold"),insertwidth=2)
+        self.textbox.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.statuslabel=ttk.Label(master=self, text="")
+        self.okbutton=ttk.Button(master=self, text="Close", width=15, command=self.destroy)
+        self.applybutton=ttk.Button(master=self, text="Apply", width=15, command=self.apply)
+        
+        # widgets aligned using grid()
+        self.infolabel.grid(row=0,column=0,columnspan=2,sticky="WENS")
+        self.textbox.grid(row=1,column=0,columnspan=2,sticky="WENS")
+        self.statuslabel.grid(row=2,column=0,columnspan=2,sticky="WENS")
+        self.okbutton.grid(row=3,column=0,sticky="WENS") 
+        self.applybutton.grid(row=3,column=1,sticky="WENS")
+        
+        # define which row and columns scale
+        self.rowconfigure(1, weight = 1)
+        self.columnconfigure(0, weight = 1)
+        self.columnconfigure(1, weight = 1)
+        
+    # compile definitions in main window and show which functions are calculated again
+    def apply(self):
+        try:
+            changed=self.master.applydefinitions(self.textbox.get("1.0", "end-1c"))
+        except (ValueError,SyntaxError) as inst:
+            tkinter.messagebox.showerror("Function definitions",str(inst),parent=self)
+            return
+        if len(changed)>0:
+            self.statuslabel.configure(text="Calculated again: "+", ".join(changed))
+        else:
+            self.statuslabel.configure(text="No changes")
+
+
+# window with plot of the power spectrum of the function
+# based on Tkinter.toplevel
+class Spectrumwindow(tkinter.Toplevel):
+    def __init__(self): 
+        super().__init__()
+        self.title("Spectrum")
+        self.geometry("800x600")
+        
+        # Figure object and canvas from Matplotlib
+        self.fig = Figure()
+        self.ax = self.fig.add_subplot()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        
+        # settings for the spectrum
+        self.windowlabel=ttk.Label(master=self, text="Window")
+        self.windowchoice=ttk.Combobox(master=self, values=("hann","hamming","blackman","flattop","boxcar"), state="readonly", width=12)
+        self.windowchoice.set("hann")
+        self.welch=tkinter.BooleanVar()
+        self.welch.set(False)
+        self.welchbutton=ttk.Checkbutton(master=self, text="Welch averaging, segment", variable=self.welch)
+        self.segmententry=tkinter.Entry(master=self, width="10",font=("FreeMono",12,"bold"),insertwidth=2)
+        self.segmententry.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.decibel=tkinter.BooleanVar()
+        self.decibel.set(True)
+        self.decibelbutton=ttk.Checkbutton(master=self, text="dB", variable=self.decibel)
+        
+        # buttons defined
+        self.okbutton=ttk.Button(master=self, text="Close", width=15, command=self.destroy)
+        self.savebutton=ttk.Button(master=self, text="Save as CSV", width=15, command=self.master.savespectrum)
+        self.gobutton=ttk.Button(master=self, text="Update", width=15, command=self.master.showspectrum)
+        
+        # widgets aligned using grid()
+        self.canvas.get_tk_widget().grid(row=0,column=0,columnspan=5,sticky="WENS")
+        self.windowlabel.grid(row=1,column=0,sticky="WENS")
+        self.windowchoice.grid(row=1,column=1,sticky="WENS")
+        self.welchbutton.grid(row=1,column=2,sticky="WENS")
+        self.segmententry.grid(row=1,column=3,sticky="WENS")
+        self.decibelbutton.grid(row=1,column=4,sticky="WENS")
+        self.okbutton.grid(row=2,column=0,columnspan=2,sticky="WENS") 
+        self.savebutton.grid(row=2,column=2,sticky="WENS")
+        self.gobutton.grid(row=2,column=3,columnspan=2,sticky="WENS")
+        
+        # define which row and columns scale
+        self.rowconfigure(0, weight = 1)
+        for n in range(5):
+            self.columnconfigure(n, weight = 1)
+    
+    # plot power in function of frequency, in dB when decibel is True
+    def plot(self,frequencies,power,decibel):
+        plotter=self.master
+        self.ax.clear()
+        if decibel:
+            with errstate(divide="ignore"):
+                self.ax.plot(frequencies, 10*log10(power), color=plotter.linecolor, linewidth=1)
+            self.ax.set_ylabel("power (dB)", fontsize = plotter.fontsize)
+        else:
+            self.ax.plot(frequencies, power, color=plotter.linecolor, linewidth=1)
+            self.ax.set_ylabel("power", fontsize = plotter.fontsize)
+        self.ax.set_xlabel("frequency (1/x)", fontsize = plotter.fontsize)
+        self.ax.set_title("Spectrum of f(x)="+plotter.txt, fontweight="bold", size=plotter.fontsize, color=plotter.linecolor)
+        self.ax.grid(color = plotter.gridcolor, linewidth = 0.5)
+        self.ax.set_facecolor(plotter.plotbackgroundcolor)
+        self.fig.set_facecolor(plotter.backgroundcolor)
+        self.ax.xaxis.label.set_color(plotter.labelcolor)
+        self.ax.yaxis.label.set_color(plotter.labelcolor)
+        self.ax.tick_params(axis='x', colors=plotter.axiscolor, labelsize=plotter.fontsize)
+        self.ax.tick_params(axis='y', colors=plotter.axiscolor, labelsize=plotter.fontsize)
+        for spine in self.ax.spines.values():
+            spine.set_color(plotter.axiscolor)
+        self.canvas.draw()
+
+
+# dialogbox for exporting the plot to several image files in the background
+# based on Tkinter.toplevel
+class Exportwindow(tkinter.Toplevel):
+    def __init__(self): 
+        super().__init__()
+        self.title("Export images")
+        
+        # buttons defined
+        self.okbutton=ttk.Button(master=self, text="Close", width=15, command=self.destroy)
+        self.gobutton=ttk.Button(master=self, text="Export", width=15, command=self.runexport)
+        
+        # labels, entries and checkbuttons defined
+        self.namelabel=ttk.Label(master=self, text="File name without extension")
+        self.nameentry=tkinter.Entry(master=self, width="40",font=("FreeMono",12,"bold"),insertwidth=2)
+        self.nameentry.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.formatlabel=ttk.Label(master=self, text="Formats")
+        self.formats={}
+        self.frameformats=ttk.Frame(master=self)
+        for n,extension in enumerate(("png","svg","pdf")):
+            self.formats[extension]=tkinter.BooleanVar()
+            self.formats[extension].set(extension=="png")
+            b=ttk.Checkbutton(master=self.frameformats, text=extension.upper(), variable=self.formats[extension])
+            b.grid(row=0, column=n, sticky="W")
+        self.dpilabel=ttk.Label(master=self, text="Resolution (dpi)")
+        self.dpientry=tkinter.Entry(master=self, width="15",font=("FreeMono",12,"bold"),insertwidth=2)
+        self.dpientry.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.tileslabel=ttk.Label(master=self, text="PNG tiles per side")
+        self.tilesentry=tkinter.Entry(master=self, width="15",font=("FreeMono",12,"bold"),insertwidth=2)
+        self.tilesentry.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.widthlabel=ttk.Label(master=self, text="Width (inch)")
+        self.widthentry=tkinter.Entry(master=self, width="15",font=("FreeMono",12,"bold"),insertwidth=2)
+        self.widthentry.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        self.heightlabel=ttk.Label(master=self, text="Height (inch)")
+        self.heightentry=tkinter.Entry(master=self, width="15",font=("FreeMono",12,"bold"),insertwidth=2)
+        self.heightentry.config({"background": "#303030","foreground": "#ffffff","insertbackground": "#ffffff"})
+        
+        # progress of the export thread
+        self.progressbar=ttk.Progressbar(master=self, orient="horizontal", mode="determinate")
+        self.statuslabel=ttk.Label(master=self, text="")
+        
+        # widgets aligned using grid()
+        self.namelabel.grid(row=0,column=0,columnspan=2,sticky="WENS")
+        self.nameentry.grid(row=1,column=0,columnspan=2,sticky="WENS")
+        self.formatlabel.grid(row=2,column=0,columnspan=2,sticky="WENS")
+        self.frameformats.grid(row=3,column=0,columnspan=2,sticky="WENS")
+        self.widthlabel.grid(row=4,column=0,sticky="WENS")
+        self.heightlabel.grid(row=4,column=1,sticky="WENS")
+        self.widthentry.grid(row=5,column=0,sticky="WENS")
+        self.heightentry.grid(row=5,column=1,sticky="WENS")
+        self.dpilabel.grid(row=6,column=0,sticky="WENS")
+        self.tileslabel.grid(row=6,column=1,sticky="WENS")
+        self.dpientry.grid(row=7,column=0,sticky="WENS")
+        self.tilesentry.grid(row=7,column=1,sticky="WENS")
+        self.progressbar.grid(row=8,column=0,columnspan=2,sticky="WENS")
+        self.statuslabel.grid(row=9,column=0,columnspan=2,sticky="WENS")
+        self.okbutton.grid(row=10,column=0,sticky="WENS") 
+        self.gobutton.grid(row=10,column=1,sticky="WENS")
+        
+        # define which columns scale
+        self.columnconfigure(0, weight = 1)
+        self.columnconfigure(1, weight = 1)
+        
+    # read entries and start export in the main window
+    def runexport(self):
+        try:
+            width=float(eval(self.widthentry.get()))
+            height=float(eval(self.heightentry.get()))
+            dpi=float(eval(self.dpientry.get()))
+            tiles=int(eval(self.tilesentry.get()))
+        except (SyntaxError,NameError,TypeError,ValueError):
+            tkinter.messagebox.showerror("Export","Size, resolution and tiles should be numbers",parent=self)
+            return
+        if (width<=0) or (height<=0) or (dpi<=0) or (tiles<1):
+            tkinter.messagebox.showerror("Export","Size, resolution and tiles should be positive",parent=self)
+            return
+        formats=[extension for extension in self.formats if self.formats[extension].get()]
+        if len(formats)==0:
+            tkinter.messagebox.showerror("Export","Select at least one format",parent=self)
+            return
+        jobs=self.master.exportjobs(self.nameentry.get(),formats,width,height,tiles)
+        self.master.startexport(jobs,width,height,dpi)
+
+
+# Plotcore with a Figure object using the Agg canvas, renders plots without Tkinter window
+# the expression is evaluated without builtins and with only the numpy names of safenames
+class Renderer(Plotcore):
+    # numpy functions and constants available in expressions of the render server
+    # no functions making new arrays like arange, the size of the arrays follows from N
+    safenames = {name:value for name,value in globals().items() if isinstance(value,ufunc)}
+    safenames.update(pi=pi,e=e,inf=inf,nan=nan,sinc=sinc,where=where,clip=clip,real=real,imag=imag, \
+        angle=angle,round=round,sum=sum,prod=prod,mean=mean,min=min,max=max,cumsum=cumsum)
+    
+    def __init__(self):
+        super().__init__()
+        self.evalglobals = dict(self.safenames,__builtins__={})
+        self.fig = Figure(figsize=(8,6))
+        FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot()
+        self.canvas = Exportcanvas()
+    
+    # render plot for request, a dict made by Renderserver.normalize()
+    # returns content type and content as bytes
+    # raises SyntaxError, NameError or TypeError when the expression is not correct
+    def render(self,request):
+        self.txt=request["expr"]
+        self.tstart=request["start"]
+        self.tstop=request["stop"]
+        self.N=request["N"]
+        self.Ncomplex=int(sqrt(self.N)) # N is the total number of points, also for the image
+        self.precision.set(request["precision"])
+        mode=request["mode"]
+        self.xymode.set(mode in ("xy","density"))
+        self.densitymode.set(mode=="density")
+        self.polarmode.set(mode=="polar")
+        self.line3dmode.set(mode=="line3d")
+        self.surface3dmode.set(mode=="surface")
+        self.complexmode.set(mode=="complex")
+        self.odemode.set(mode=="ode")
+        self.setcolors(**colorpresets[request["preset"]])
+        self.evaluate()
+        if request["format"]=="json":
+            # samples for the x values, constant functions are given for all x values
+            x=self.odex if self.odemode.get() else self.t
+            y=self.y if type(self.y) is tuple else (self.y,)
+            if self.surface3dmode.get():
+                fullshape=self.v.shape
+            elif self.odemode.get() or self.complexmode.get():
+                fullshape=shape(self.y)
+            else:
+                fullshape=x.shape
+            samples={"x":self.jsonlist(x),"y":[self.jsonlist(broadcast_to(yy,fullshape)) for yy in y]}
+            return("application/json",json.dumps(samples).encode("UTF8"))
+        self.plotcurrent()
+        output=io.BytesIO()
+        self.fig.savefig(output,format=request["format"])
+        return(Renderserver.contenttypes[request["format"]],output.getvalue())
+    
+    # ndarray as (nested) list for JSON, values which are not finite become None (null)
+    # raises ValueError for complex values, JSON has no complex numbers
+    def jsonlist(self,a):
+        a=asarray(a)
+        if a.dtype.kind=="c":
+            raise ValueError("Function gives complex values, not possible in JSON")
+        if a.dtype.kind=="f":
+            values=a.astype(float64).astype(object) # longdouble as Python float
+            values[~isfinite(a)]=None
+            return(values.tolist())
+        return(a.tolist())
+
+
+# HTTP server on localhost rendering plots for other programs, without Tkinter window
+# GET /render?expr=sin(x)&start=-pi&stop=pi&mode=fx&N=1000&preset=Greys&format=png
+#   mode fx, xy, density, polar, line3d, surface, complex or ode, format png, svg or json (samples)
+#   precision float32, float64 or longdouble
+# GET /metrics returns number of requests, cache hits and latencies as JSON
+# expr, start and stop are checked by checkexpression(), only numpy names, no attributes
+# requests with a Host header other than localhost are refused
+# the cache holds at most cachesize results and cachebytes bytes, larger results are not cached
+class Renderserver(ThreadingHTTPServer):
+    daemon_threads = True
+    contenttypes = {"png":"image/png","svg":"image/svg+xml","json":"application/json"}
+    modes = ("fx","xy","density","polar","line3d","surface","complex","ode")
+    inputerrors = (ValueError,SyntaxError,NameError,TypeError,ArithmeticError) # reply 400, other errors 500
+    
+    def __init__(self,port=8000,Nworkers=4,cachesize=128,cachebytes=256*2**20):
+        super().__init__(("127.0.0.1",port),Renderhandler)
+        self.pool=ThreadPoolExecutor(max_workers=Nworkers) # renders at most Nworkers plots at once
+        self.renderers=threading.local() # one Renderer per worker thread
+        self.cache={} # rendered results, key normalized request, oldest entry first
+        self.cachesize=cachesize
+        self.cachebytes=cachebytes
+        self.Ncachebytes=0 # total size of the content in the cache
+        self.Nmaxcachedbytes=cachebytes//16 # larger results are not cached
+        self.lock=threading.Lock() # protects cache and metrics
+        self.latencies=[] # latency in ms of the last Nlatencies requests
+        self.Nlatencies=1000
+        self.Nrequests=0
+        self.Ncachehits=0
+        self.Nerrors=0
+    
+    # request from query string as dict with values of the correct type and in fixed format
+    # raises ValueError when a value is not correct
+    def normalize(self,query):
+        def value(name,default):
+            return(query.get(name,[default])[0].strip())
+        request={}
+        request["expr"]=value("expr","x")
+        tree=self.checkexpression(request["expr"],set(Renderer.safenames)|{"x","y","z"})
+        request["exprkey"]=ast.dump(tree) # same for expressions which only differ in spacing
+        constants={"pi":pi,"e":e}
+        try:
+            request["start"]=float(eval(compile(self.checkexpression(value("start","-1"),set(constants)),"start","eval"),
+                dict(constants,__builtins__={})))
+            request["stop"]=float(eval(compile(self.checkexpression(value("stop","1"),set(constants)),"stop","eval"),
+                dict(constants,__builtins__={})))
+            request["N"]=int(value("N","1000"))
+        except (SyntaxError,NameError,TypeError,ValueError,ZeroDivisionError,OverflowError):
+            raise ValueError("start, stop and N should be numbers")
+        if not (request["start"]<request["stop"]):
+            raise ValueError("start should be smaller than stop")
+        if not (2<=request["N"]<=10000000):
+            raise ValueError("N should be between 2 and 10000000")
+        request["mode"]=value("mode","fx")
+        if request["mode"] not in self.modes:
+            raise ValueError("mode should be one of "+", ".join(self.modes))
+        request["preset"]=value("preset","Greys")
+        if request["preset"] not in colorpresets:
+            raise ValueError("preset should be one of "+", ".join(colorpresets))
+        request["format"]=value("format","png")
+        if request["format"] not in self.contenttypes:
+            raise ValueError("format should be one of "+", ".join(self.contenttypes))
+        request["precision"]=value("precision","float64")
+        if request["precision"] not in ("float32","float64","longdouble"):
+            raise ValueError("precision should be float32, float64 or longdouble")
+        return(request)
+    
+    # syntax tree of expression txt, raises ValueError unless it only contains numbers,
+    # operators, comparisons, conditional expressions, tuples and calls of the names in names
+    # no attributes, subscripts, strings or lambdas, so nothing outside numpy can be reached
+    # a power of numbers only needs a number up to Nmaxexponent as exponent and no power as base,
+    # Python calculates such powers with integers of unlimited size (10**10**9 takes hours)
+    Nmaxexponent = 1000
+    def checkexpression(self,txt,names):
+        try:
+            tree=ast.parse(txt,mode="eval")
+        except SyntaxError as inst:
+            raise ValueError("Expression not correct: "+str(inst.msg))
+        allowed=(ast.Expression,ast.BinOp,ast.UnaryOp,ast.BoolOp,ast.Compare,ast.IfExp,ast.Call,ast.keyword, \
+            ast.Name,ast.Load,ast.Constant,ast.Tuple,ast.operator,ast.unaryop,ast.boolop,ast.cmpop)
+        for node in ast.walk(tree):
+            if not isinstance(node,allowed):
+                raise ValueError(f"Expression not correct: {type(node).__name__} not allowed")
+            if isinstance(node,ast.Name) and (node.id not in names):
+                raise ValueError(f"Expression not correct: name {node.id} not allowed")
+            if isinstance(node,ast.Call) and not isinstance(node.func,ast.Name):
+                raise ValueError("Expression not correct: only functions by name can be called")
+            if isinstance(node,ast.Constant) and (type(node.value) not in (int,float,complex,bool)):
+                raise ValueError("Expression not correct: only numbers as constants")
+            if isinstance(node,ast.BinOp) and isinstance(node.op,ast.Pow) and self.numbersonly(node.left):
+                exponent=node.right.operand if isinstance(node.right,ast.UnaryOp) else node.right
+                if not (isinstance(exponent,ast.Constant) and (type(exponent.value) in (int,float)) and \
+                    (-self.Nmaxexponent<=exponent.value<=self.Nmaxexponent)) or \
+                    any([isinstance(child,ast.BinOp) and isinstance(child.op,ast.Pow) for child in ast.walk(node.left)]):
+                    raise ValueError(f"Expression not correct: power of numbers only with a number up to {self.Nmaxexponent} as exponent")
+        return(tree)
+    
+    # True when the syntax tree node contains no names, only numbers
+    def numbersonly(self,node):
+        return(not any([isinstance(child,ast.Name) for child in ast.walk(node)]))
+    
+    # content type and content for request, out of the cache or rendered by the worker pool
+    # returns also True when the result came out of the cache
+    def result(self,request):
+        key=tuple(value for name,value in request.items() if name!="expr") # exprkey instead of expr
+        with self.lock:
+            if key in self.cache:
+                result=self.cache.pop(key) # reinserted below as newest entry
+                self.cache[key]=result
+                return(result,True)
+        result=self.pool.submit(self.renderjob,request).result()
+        Nbytes=len(result[1])
+        if Nbytes>self.Nmaxcachedbytes:
+            return(result,False)
+        with self.lock:
+            if key not in self.cache:
+                self.cache[key]=result
+                self.Ncachebytes+=Nbytes
+            while (len(self.cache)>self.cachesize) or (self.Ncachebytes>self.cachebytes):
+                self.Ncachebytes-=len(self.cache.pop(next(iter(self.cache)))[1])
+        return(result,False)
+    
+    # runs in a worker thread of the pool, every thread has its own Renderer
+    def renderjob(self,request):
+        if not hasattr(self.renderers,"renderer"):
+            self.renderers.renderer=Renderer()
+        return(self.renderers.renderer.render(request))
+    
+    # register latency in ms of a finished request
+    def addlatency(self,latency,cachehit,error):
+        with self.lock:
+            self.Nrequests+=1
+            self.Ncachehits+=int(cachehit)
+            self.Nerrors+=int(error)
+            self.latencies.append(latency)
+            if len(self.latencies)>self.Nlatencies:
+                del self.latencies[0]
+    
+    # metrics of the server as dict
+    def metrics(self):
+        with self.lock:
+            latencies=array(self.latencies)
+            metrics={"requests":self.Nrequests,"cachehits":self.Ncachehits,"errors":self.Nerrors, \
+                "cacheentries":len(self.cache),"cachebytes":self.Ncachebytes}
+        if len(latencies)>0:
+            metrics["latency_ms"]={"mean":float(latencies.mean()),"p50":float(percentile(latencies,50)), \
+                "p95":float(percentile(latencies,95)),"max":float(latencies.max())}
+        return(metrics)
+
+
+# handles one HTTP request for the Renderserver
+class Renderhandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        starttime=time.perf_counter()
+        host=self.headers.get("Host","").rsplit(":",1)[0]
+        if host not in ("127.0.0.1","localhost"): # request from a web page for another site
+            self.reply(403,"text/plain",b"Only requests for localhost")
+            return
+        url=urlparse(self.path)
+        if url.path=="/metrics":
+            self.reply(200,"application/json",json.dumps(self.server.metrics()).encode("UTF8"))
+            return
+        if url.path!="/render":
+            self.reply(404,"text/plain",b"Use /render or /metrics")
+            return
+        cachehit=False
+        try:
+            request=self.server.normalize(parse_qs(url.query))
+            (contenttype,content),cachehit=self.server.result(request)
+            status=200
+        except self.server.inputerrors as inst:
+            status,contenttype,content=400,"text/plain",str(inst).encode("UTF8")
+        except Exception as inst: # e.g. MemoryError, the request gets a reply and is counted anyway
+            status,contenttype,content=500,"text/plain",f"Rendering failed: {type(inst).__name__}".encode("UTF8")
+        latency=(time.perf_counter()-starttime)*1000
+        self.server.addlatency(latency,cachehit,status!=200)
+        self.reply(status,contenttype,content,{"X-Render-Time-ms":f"{latency:.1f}","X-Cache":"hit" if cachehit else "miss"})
+    
+    # send reply with status, content type, content and extra headers
+    def reply(self,status,contenttype,content,headers={}):
+        self.send_response(status)
+        self.send_header("Content-Type",contenttype)
+        self.send_header("Content-Length",str(len(content)))
+        for name,value in headers.items():
+            self.send_header(name,value)
+        self.end_headers()
+        self.wfile.write(content)
 
 
-# een instance of Plotter()
-plotter=Plotter()
-# de mainloop starten
-plotter.mainloop()
+if __name__ == "__main__":
+    if "--serve" in sys.argv:
+        # render server instead of Tkinter window, port can follow --serve
+        i=sys.argv.index("--serve")
+        port=int(sys.argv[i+1]) if len(sys.argv)>i+1 else 8000
+        server=Renderserver(port)
+        print(f"Render server on http://127.0.0.1:{port}/render")
+        server.serve_forever()
+    else:
+        # een instance of Plotter()
+        plotter=Plotter()
+        # de mainloop starten
+        plotter.mainloop()